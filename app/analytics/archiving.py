@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import numpy as np
+
+DAY_SECONDS = 86400
+
+# Stored for datasets without a parseable last_updated; sorts as "newest",
+# so they never match an age threshold (as NaN ages never did).
+NO_DATE = np.iinfo(np.int64).max
+
+
+def local_now():
+    """Naive local time as epoch seconds (what pd.Timestamp.now() compares against)."""
+    return int(np.datetime64(datetime.now(), "s").astype(np.int64))
+
+
+class ArchiveIndex:
+    """
+    Sorted index arrays over a dataset catalog for the Archiving Simulator.
+
+    Built once per catalog version. A query
+
+        days idle > max_age_days  OR  (size > min_size_mb AND rows < max_rows)
+
+    never touches the whole catalog:
+      - "old" is a prefix of the last_updated order (searchsorted), so its
+        count and size total come from a prefix sum;
+      - the size/rows term is a suffix of the size order (searchsorted);
+        only that suffix is scanned, with last_updated and record_count
+        stored permuted into size order so the scan is contiguous, and old
+        rows already counted are masked out of it;
+      - the largest candidates are read from the end of the size order.
+    Results hold positions into the catalog frame, which is never copied.
+    """
+
+    def __init__(self, last_updated, file_size_mb, record_count):
+        updated = np.asarray(last_updated, dtype=np.int64)
+        size = np.asarray(file_size_mb, dtype=np.float64)
+        rows = np.asarray(record_count, dtype=np.float64)
+        self.n = len(size)
+
+        by_updated = np.argsort(updated, kind="stable")
+        self.sorted_updated = updated[by_updated]
+        self.size_by_age = np.concatenate(([0.0], np.cumsum(size[by_updated])))
+
+        self.by_size = np.argsort(size, kind="stable")
+        self.size_s = size[self.by_size]
+        self.updated_s = updated[self.by_size]
+        self.rows_s = rows[self.by_size]
+
+    @classmethod
+    def from_frame(cls, df):
+        """From a catalog DataFrame with last_updated (datetime64), file_size_mb, record_count."""
+        stamps = df["last_updated"].to_numpy(dtype="datetime64[s]")
+        updated = np.where(np.isnat(stamps), NO_DATE, stamps.astype(np.int64))
+        return cls(updated, df["file_size_mb"].to_numpy(), df["record_count"].to_numpy())
+
+    def query(self, max_age_days: float, min_size_mb: float, max_rows: float,
+              top_k: int = 100, now=None):
+        """
+        Returns {"count", "savings_mb", "top"}: top is up to top_k catalog
+        row positions, largest file_size_mb first. now is naive local epoch
+        seconds, like the naive timestamps in last_updated.
+        """
+        now = local_now() if now is None else now
+        # whole days idle > max_age_days  <=>  last_updated <= cutoff
+        cutoff = int(np.floor(now - (max_age_days + 1) * DAY_SECONDS))
+        n_old = int(np.searchsorted(self.sorted_updated, cutoff, side="right"))
+        first_large = int(np.searchsorted(self.size_s, min_size_mb, side="right"))
+
+        # large & sparse & not already counted as old
+        extra = ((self.rows_s[first_large:] < max_rows)
+                 & (self.updated_s[first_large:] > cutoff))
+        count = n_old + int(np.count_nonzero(extra))
+        savings = float(self.size_by_age[n_old] + self.size_s[first_large:] @ extra)
+
+        return {"count": count, "savings_mb": savings,
+                "top": self._top(min(top_k, count), cutoff, first_large, max_rows)}
+
+    def _top(self, want, cutoff, first_large, max_rows):
+        """Scan the size order from the largest end until want candidates are found."""
+        if want <= 0:
+            return np.empty(0, dtype=np.int64)
+        chunk = max(4 * want, 1024)
+        while True:
+            start = max(self.n - chunk, 0)
+            match = self.updated_s[start:] <= cutoff
+            lo = max(first_large, start) - start
+            match[lo:] |= self.rows_s[start + lo:] < max_rows
+            hits = np.flatnonzero(match)[::-1][:want]
+            if len(hits) >= want or start == 0:
+                return self.by_size[start + hits]
+            chunk *= 4
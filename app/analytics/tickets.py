@@ -0,0 +1,192 @@
+import sqlite3
+import time
+
+import numpy as np
+
+DAY_SECONDS = 86400
+
+# Stored in the epoch arrays where a date is NULL or unparseable.
+MISSING = np.iinfo(np.int64).min
+
+# priority -> days a ticket may stay unresolved before it breaches SLA
+SLA_DAYS = {"urgent": 1, "high": 2, "medium": 5, "low": 10}
+DEFAULT_SLA_DAYS = 5
+
+
+def _codes(values):
+    """Categorical encode: (int32 codes, labels) with labels in first-seen order (None kept)."""
+    index = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values),
+        dtype=np.int32, count=len(values)
+    )
+    return codes, list(index)
+
+
+def load_ticket_columns(conn: sqlite3.Connection):
+    """
+    Read it_tickets into column arrays, ordered by id.
+
+    Dates are converted to int64 Unix seconds by SQLite (MISSING where
+    NULL/unparseable); status, priority and assigned_to become int32 codes
+    plus a "<name>_labels" list.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT id, title, priority, status, assigned_to,
+               COALESCE(CAST(strftime('%s', created_date) AS INTEGER), {MISSING}),
+               COALESCE(CAST(strftime('%s', resolved_date) AS INTEGER), {MISSING})
+        FROM it_tickets
+        ORDER BY id
+    """)
+    rows = cursor.fetchall()
+    ids, titles, priorities, statuses, assignees, created, resolved = (
+        zip(*rows) if rows else ((),) * 7
+    )
+    cols = {
+        "id": np.array(ids, dtype=np.int64),
+        "title": np.array(titles, dtype=object),
+        "created": np.array(created, dtype=np.int64),
+        "resolved": np.array(resolved, dtype=np.int64),
+    }
+    cols["status"], cols["status_labels"] = _codes(statuses)
+    cols["priority"], cols["priority_labels"] = _codes(priorities)
+    cols["assignee"], cols["assignee_labels"] = _codes(assignees)
+    return cols
+
+
+def ticket_columns(frame):
+    """
+    Same arrays as load_ticket_columns() from a typed it_tickets frame
+    (snapshot_frame), without a SQLite read. NaT dates are MISSING.
+    """
+    def epoch(name):
+        # NaT is int64 min, i.e. MISSING
+        return frame[name].to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+    def objects(name):
+        return frame[name].to_numpy(dtype=object, na_value=None)
+
+    cols = {
+        "id": frame["id"].to_numpy(dtype=np.int64),
+        "title": objects("title"),
+        "created": epoch("created_date"),
+        "resolved": epoch("resolved_date"),
+    }
+    cols["status"], cols["status_labels"] = _codes(objects("status"))
+    cols["priority"], cols["priority_labels"] = _codes(objects("priority"))
+    cols["assignee"], cols["assignee_labels"] = _codes(objects("assigned_to"))
+    return cols
+
+
+def _group_percentiles(values, groups, n_groups, qs):
+    """
+    Per-group linear-interpolated percentiles without a Python loop:
+    one lexsort by (group, value), then index arithmetic on group offsets.
+    Returns an (n_groups, len(qs)) array, NaN for empty groups.
+    """
+    out = np.full((n_groups, len(qs)), np.nan)
+    if len(values) == 0:
+        return out
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    present = counts > 0
+    for j, q in enumerate(qs):
+        pos = starts[present] + (counts[present] - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        out[present, j] = sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+    return out
+
+
+def ticket_stats(cols, now=None, sla_days=SLA_DAYS, top_n: int = 10, percentiles=(50, 90)):
+    """
+    Aging, SLA breaches, per-assignee resolution stats and the top_n
+    slowest resolved tickets from load_ticket_columns() arrays, all with
+    vectorized NumPy operations.
+
+    Returns a dict:
+      total, open, waiting_user, avg_resolution_days
+      age_days, resolution_days   float arrays aligned with cols (NaN if unknown)
+      aging_by_status             {status: mean age} over non-closed tickets
+      sla                         {"open_breached", "resolved_breached", "by_priority"}
+      assignee_resolution         {assignee: {"count", "mean", "p50", "p90", ...}}
+      slowest                     row positions, slowest first (argpartition + sort of top_n)
+    """
+    now = int(time.time()) if now is None else int(now)
+    created, resolved = cols["created"], cols["resolved"]
+    status, priority, assignee = cols["status"], cols["priority"], cols["assignee"]
+    status_labels = [str(s).lower() for s in cols["status_labels"]]
+    priority_labels = cols["priority_labels"]
+    assignee_labels = cols["assignee_labels"]
+
+    has_created = created != MISSING
+    is_resolved = has_created & (resolved != MISSING)
+    age_days = np.where(has_created, (now - created) / DAY_SECONDS, np.nan)
+    resolution_days = np.where(is_resolved, (resolved - created) / DAY_SECONDS, np.nan)
+
+    def has_status(label):
+        # "Closed" and "closed" are separate codes; match every spelling
+        return np.isin(status, [i for i, s in enumerate(status_labels) if s == label])
+
+    is_open = ~has_status("closed")
+
+    # aging: mean age per status over non-closed tickets
+    aging_mask = is_open & has_created
+    n_status = len(status_labels)
+    age_sum = np.bincount(status[aging_mask], weights=age_days[aging_mask], minlength=n_status)
+    age_cnt = np.bincount(status[aging_mask], minlength=n_status)
+    aging_by_status = {
+        cols["status_labels"][i]: float(age_sum[i] / age_cnt[i]) for i in np.flatnonzero(age_cnt)
+    }
+
+    # SLA: per-row limit looked up from the priority code
+    limits = np.array([sla_days.get(str(p).lower(), DEFAULT_SLA_DAYS) for p in priority_labels],
+                      dtype=np.float64)
+    row_limit = limits[priority] if len(priority) else np.empty(0)
+    open_breached = aging_mask & (age_days > row_limit)
+    resolved_breached = is_resolved & (resolution_days > row_limit)
+    breach_counts = np.bincount(priority[open_breached], minlength=len(priority_labels))
+    sla = {
+        "open_breached": int(open_breached.sum()),
+        "resolved_breached": int(resolved_breached.sum()),
+        "by_priority": {priority_labels[i]: int(breach_counts[i]) for i in np.flatnonzero(breach_counts)},
+    }
+
+    # per-assignee resolution: count/mean via bincount, percentiles via one lexsort
+    resolved_idx = np.flatnonzero(is_resolved)
+    res_values = resolution_days[resolved_idx]
+    res_groups = assignee[resolved_idx]
+    n_assignees = len(assignee_labels)
+    res_cnt = np.bincount(res_groups, minlength=n_assignees)
+    res_sum = np.bincount(res_groups, weights=res_values, minlength=n_assignees)
+    pct = _group_percentiles(res_values, res_groups, n_assignees, percentiles)
+    assignee_resolution = {}
+    for i in np.flatnonzero(res_cnt):
+        entry = {"count": int(res_cnt[i]), "mean": float(res_sum[i] / res_cnt[i])}
+        for j, q in enumerate(percentiles):
+            entry[f"p{q}"] = float(pct[i, j])
+        label = assignee_labels[i]
+        assignee_resolution["unassigned" if label is None else label] = entry
+
+    # top-N slowest: O(n) argpartition, then sort only the N picked
+    if len(resolved_idx) > top_n > 0:
+        picked = np.argpartition(-res_values, top_n - 1)[:top_n]
+    else:
+        picked = np.arange(len(resolved_idx))
+    picked = picked[np.argsort(-res_values[picked], kind="stable")][:max(top_n, 0)]
+
+    return {
+        "total": int(len(status)),
+        "open": int(has_status("open").sum()),
+        "waiting_user": int(has_status("waiting_user").sum()),
+        "avg_resolution_days": float(res_values.mean()) if len(res_values) else 0.0,
+        "age_days": age_days,
+        "resolution_days": resolution_days,
+        "aging_by_status": aging_by_status,
+        "sla": sla,
+        "assignee_resolution": assignee_resolution,
+        "slowest": resolved_idx[picked],
+    }
@@ -0,0 +1,101 @@
+import sqlite3
+
+# Max host parameters per IN (...) lookup; stays under SQLITE_MAX_VARIABLE_NUMBER.
+ID_CHUNK = 500
+
+
+def normalize_rows(rows, fields, required=()):
+    """
+    Turn dicts or positional sequences into parameter tuples ordered by fields.
+    Returns (params, errors) where params is a list of (index, tuple) and
+    errors a list of (index, message) for rows that failed validation.
+    """
+    params, errors = [], []
+    for i, row in enumerate(rows):
+        if isinstance(row, dict):
+            values = tuple(row.get(f) for f in fields)
+        else:
+            values = tuple(row) + (None,) * (len(fields) - len(row))
+            if len(values) > len(fields):
+                errors.append((i, f"expected at most {len(fields)} values, got {len(row)}"))
+                continue
+        missing = [f for f, v in zip(fields, values) if f in required and v is None]
+        if missing:
+            errors.append((i, f"missing required field(s): {', '.join(missing)}"))
+            continue
+        params.append((i, values))
+    return params, errors
+
+
+def existing_ids(conn: sqlite3.Connection, table: str, ids):
+    """Return the subset of ids present in table, queried in chunks."""
+    found = set()
+    ids = list(ids)
+    cursor = conn.cursor()
+    for start in range(0, len(ids), ID_CHUNK):
+        chunk = ids[start:start + ID_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT id FROM {table} WHERE id IN ({marks})", chunk)
+        found.update(r[0] for r in cursor.fetchall())
+    return found
+
+
+def run_batch(conn: sqlite3.Connection, sql: str, params, returning_ids: bool = False):
+    """
+    Execute sql for every (index, tuple) in params inside one transaction.
+
+    The fast path is a single executemany. If any row raises, the batch is
+    rolled back to its savepoint and replayed row by row so the good rows
+    still land and each bad one is reported.
+
+    Returns (results, errors): with returning_ids, results holds one new id
+    per params entry (None where that row failed); otherwise it is the
+    number of affected rows.
+
+    Commits at the end, unless the caller already had a transaction open
+    (then the batch is only released into it and the caller commits).
+    """
+    cursor = conn.cursor()
+    if not params:
+        return ([] if returning_ids else 0), []
+
+    owns_transaction = not conn.in_transaction
+    cursor.execute("SAVEPOINT batch_write")
+    try:
+        cursor.executemany(sql, [p for _, p in params])
+        if returning_ids:
+            # One writer holds the lock for the whole batch, so AUTOINCREMENT
+            # hands out a contiguous block ending at last_insert_rowid().
+            last = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            results = list(range(last - len(params) + 1, last + 1))
+        else:
+            results = cursor.rowcount
+        errors = []
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO batch_write")
+        results = [] if returning_ids else 0
+        errors = []
+        for i, p in params:
+            try:
+                cursor.execute(sql, p)
+            except sqlite3.Error as e:
+                errors.append((i, str(e)))
+                if returning_ids:
+                    results.append(None)
+                continue
+            if returning_ids:
+                results.append(cursor.lastrowid)
+            else:
+                results += cursor.rowcount
+    cursor.execute("RELEASE batch_write")
+    if owns_transaction:
+        conn.commit()
+    return results, errors
+
+
+def align_ids(total: int, params, ids):
+    """Spread ids from run_batch back over the original row positions."""
+    out = [None] * total
+    for (i, _), new_id in zip(params, ids):
+        out[i] = new_id
+    return out
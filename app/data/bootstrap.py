@@ -0,0 +1,162 @@
+import multiprocessing as mp
+import queue
+import sqlite3
+import time
+from pathlib import Path
+
+from .cache import bump_table_version
+from .ingest import INGEST_SPECS, CHUNK_SIZE, stream_csv, source_key, row_hash, insert_sql
+
+DATA_DIR = Path("DATA")
+
+# table -> seed CSV, in the order main.py used to load them
+SEED_FILES = {
+    "cyber_incidents": "cyber_incidents_1000.csv",
+    "datasets_metadata": "datasets_metadata_1000.csv",
+    "it_tickets": "it_tickets_1000.csv",
+}
+
+# Chunks buffered between the parsers and the writer; bounds memory and
+# makes fast parsers wait for the writer instead of piling up rows.
+QUEUE_CHUNKS = 16
+
+# Seconds to wait for a chunk before checking that the parsers are alive.
+WORKER_POLL = 1.0
+
+
+def table_is_empty(conn: sqlite3.Connection, table: str):
+    """EXISTS probe: stops at the first row instead of fetching the table."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+    return not cursor.fetchone()[0]
+
+
+def count_rows(conn: sqlite3.Connection, table: str):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def _parse_worker(table, csv_path, keyed, chunk_size, out):
+    """
+    Runs in a child process: parse and map one CSV, push row chunks to out.
+    Always finishes with ("done", table, seconds) or ("error", table, message).
+    """
+    start = time.perf_counter()
+    try:
+        required, _, to_row = INGEST_SPECS[table]
+        for chunk in stream_csv(csv_path, chunk_size, required):
+            rows = [to_row(rec) for rec in chunk]
+            if keyed:
+                rows = [row + (source_key(rec, row), row_hash(row)) for rec, row in zip(chunk, rows)]
+            out.put(("rows", table, rows))
+        out.put(("done", table, time.perf_counter() - start))
+    except Exception as e:
+        out.put(("error", table, f"{type(e).__name__}: {e}"))
+
+
+def bootstrap_tables(conn: sqlite3.Connection, seed_files=None, data_dir=DATA_DIR,
+                     chunk_size: int = CHUNK_SIZE, parallel: bool = True):
+    """
+    Seed every empty table from its CSV.
+
+    Each CSV is parsed in its own worker process; this process is the single
+    writer and inserts chunks as they arrive inside one transaction. Tables
+    that already have rows are skipped (checked with EXISTS).
+
+    Returns {"loaded": {table: rows}, "skipped": [tables],
+             "timings": {stage: seconds}, "errors": {table: message}}.
+    """
+    seed_files = SEED_FILES if seed_files is None else seed_files
+    timings, loaded, errors, skipped = {}, {}, {}, []
+
+    start = time.perf_counter()
+    jobs = {}
+    for table, filename in seed_files.items():
+        if not table_is_empty(conn, table):
+            skipped.append(table)
+            continue
+        csv_path = Path(data_dir) / filename
+        if not csv_path.exists():
+            errors[table] = f"CSV not found: {csv_path}"
+            continue
+        jobs[table] = csv_path
+    timings["check_empty"] = time.perf_counter() - start
+
+    if not jobs:
+        return {"loaded": loaded, "skipped": skipped, "timings": timings, "errors": errors}
+
+    sql, keyed = {}, {}
+    for table in jobs:
+        sql[table], keyed[table] = insert_sql(conn, table)
+
+    ctx = mp.get_context()
+    out = ctx.Queue(maxsize=QUEUE_CHUNKS) if parallel else queue.Queue()
+    workers = {}
+    started = {}
+
+    if conn.in_transaction:
+        conn.commit()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    try:
+        for table, csv_path in jobs.items():
+            started[table] = time.perf_counter()
+            loaded[table] = 0
+            if parallel:
+                proc = ctx.Process(target=_parse_worker, args=(table, csv_path, keyed[table], chunk_size, out))
+                proc.start()
+                workers[table] = proc
+            else:
+                _parse_worker(table, csv_path, keyed[table], chunk_size, out)
+
+        pending = set(jobs)
+        write_time = dict.fromkeys(jobs, 0.0)
+        exited = set()
+        while pending:
+            try:
+                kind, table, payload = out.get(timeout=WORKER_POLL)
+            except queue.Empty:
+                # A worker flushes its messages before exiting, so one seen
+                # dead before a wait that came back empty will send nothing more.
+                lost = [t for t in pending if t in exited]
+                if lost:
+                    codes = ", ".join(f"{t} (exit code {workers[t].exitcode})" for t in lost)
+                    raise RuntimeError(f"parse worker died without finishing: {codes}")
+                exited = {t for t in pending if t in workers and not workers[t].is_alive()}
+                continue
+            if kind == "rows":
+                t0 = time.perf_counter()
+                cursor.executemany(sql[table], payload)
+                loaded[table] += cursor.rowcount
+                write_time[table] += time.perf_counter() - t0
+            else:
+                pending.discard(table)
+                if kind == "error":
+                    errors[table] = payload
+                else:
+                    timings[f"parse:{table}"] = payload
+                timings[f"load:{table}"] = time.perf_counter() - started[table]
+        for table, seconds in write_time.items():
+            timings[f"write:{table}"] = seconds
+
+        if errors:
+            # keep the all-or-nothing contract per table: drop partial rows
+            for table in errors:
+                if table in jobs:
+                    cursor.execute(f"DELETE FROM {table}")
+                    loaded[table] = 0
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        for proc in workers.values():
+            proc.terminate()
+        raise
+    finally:
+        for proc in workers.values():
+            proc.join()
+        for table in jobs:
+            bump_table_version(table)
+
+    timings["total"] = time.perf_counter() - start
+    return {"loaded": loaded, "skipped": skipped, "timings": timings, "errors": errors}
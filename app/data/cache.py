@@ -0,0 +1,125 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+# Default lifetime (seconds) of a cached loader result.
+DEFAULT_TTL = 60.0
+
+# Max cached results kept across all loaders before LRU eviction.
+DEFAULT_MAXSIZE = 64
+
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def table_version(table: str):
+    """Current write version of a table (0 until its first write)."""
+    with _versions_lock:
+        return _versions.get(table, 0)
+
+
+def bump_table_version(*tables):
+    """
+    Mark tables as changed. Called by every insert/update/delete/load
+    function so cached reads of those tables miss on their next lookup.
+    """
+    with _versions_lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+class QueryCache:
+    """
+    LRU cache with per-entry TTL. Keys embed the versions of the tables a
+    result was read from, so a write makes old entries unreachable; they
+    then age out through TTL or LRU eviction.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key):
+        """Return (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return True, value
+
+    def put(self, key, value, ttl: float = DEFAULT_TTL):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def discard(self, key):
+        """Drop one entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        """Copy of the counters plus current size and hit rate."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+query_cache = QueryCache()
+
+
+def cached_query(*tables, ttl: float = DEFAULT_TTL):
+    """
+    Decorator for read-only data loaders:
+
+        @cached_query("it_tickets", ttl=300)
+        def get_data():
+            ...
+
+    Results are keyed by loader name, arguments and the versions of tables,
+    so any write to those tables makes the next call re-query. The cached
+    object is shared between callers and must not be mutated in place.
+    """
+    def decorator(func):
+        # Streamlit runs every page as __main__, so qualify by source file too.
+        name = f"{func.__code__.co_filename}:{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            versions = tuple(table_version(t) for t in tables)
+            key = (name, tables, args, tuple(sorted(kwargs.items())), versions)
+            found, value = query_cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            query_cache.put(key, value, ttl)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """Hit/miss/expiry/eviction counters for the shared query cache."""
+    return query_cache.snapshot()
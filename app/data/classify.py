@@ -0,0 +1,39 @@
+# Keyword classifier for incident titles. The first category with a
+# keyword contained in the (lower-cased) title wins; no match -> "other".
+#
+# Schema migration 7 compiles this table into the generated
+# cyber_incidents.incident_category column (STORED since migration 10), so
+# changing it needs a new migration that rebuilds the table with the new
+# expression, as migration 10 does.
+INCIDENT_CATEGORIES = (
+    ("phishing", ("phish",)),
+    ("email_compromise", ("business email compromise", "email compromise")),
+    ("ransomware", ("ransom",)),
+    ("malware", ("malware", "virus", "trojan", "worm")),
+    ("ddos", ("ddos", "denial of service")),
+    ("web_attack", ("sql injection", "xss", "cross-site")),
+    ("credential_attack", ("credential", "brute force", "password spray")),
+    ("data_exfiltration", ("exfiltration", "data leak", "data breach")),
+    ("insider_threat", ("insider",)),
+    ("supply_chain", ("supply chain",)),
+    ("exploit", ("zero-day", "exploit", "vulnerability")),
+)
+DEFAULT_CATEGORY = "other"
+
+
+def classify_incident(title):
+    """Category for an incident title (same rules as the SQL column)."""
+    text = (title or "").lower()
+    for category, keywords in INCIDENT_CATEGORIES:
+        if any(keyword in text for keyword in keywords):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def category_sql(column: str = "title"):
+    """The classifier as a deterministic SQL CASE expression over column."""
+    whens = []
+    for category, keywords in INCIDENT_CATEGORIES:
+        test = " OR ".join(f"instr(lower({column}), '{k}') > 0" for k in keywords)
+        whens.append(f"WHEN {test} THEN '{category}'")
+    return f"CASE {' '.join(whens)} ELSE '{DEFAULT_CATEGORY}' END"
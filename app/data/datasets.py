@@ -2,11 +2,17 @@ import pandas as pd
 from pathlib import Path
 import sqlite3
 
-from .db import connect_database
+from .db import get_connection
+from .cache import bump_table_version
 from .schema import create_datasets_metadata_table
+from .ingest import ingest_csv
+from .sync import sync_csv
+from models import Dataset, model_row_factory
 
 DATA_DIR = Path("DATA")
 
+dataset_row = model_row_factory(Dataset)
+
 def insert_dataset(
     conn: sqlite3.Connection,
     dataset_name: str,
@@ -24,39 +30,45 @@ def insert_dataset(
         VALUES (?, ?, ?, ?, ?, ?)
     """, (dataset_name, category, source, last_updated, record_count, file_size_mb))
     conn.commit()
+    bump_table_version("datasets_metadata")
     return cursor.lastrowid
 
+def get_dataset_by_id(conn: sqlite3.Connection, dataset_id: int):
+    """Fetch one dataset by id as a Dataset (None if missing)."""
+    cursor = conn.cursor()
+    cursor.row_factory = dataset_row
+    cursor.execute("SELECT * FROM datasets_metadata WHERE id = ?", (dataset_id,))
+    return cursor.fetchone()
+
 def get_all_datasets(conn: sqlite3.Connection = None):
     """Return all datasets as a DataFrame."""
-    close_after = False
     if conn is None:
-        conn = connect_database()
-        close_after = True
+        with get_connection() as conn:
+            return get_all_datasets(conn)
 
-    df = pd.read_sql_query(
+    return pd.read_sql_query(
         "SELECT * FROM datasets_metadata ORDER BY id DESC",
         conn
     )
 
-    if close_after:
-        conn.close()
-
-    return df
-
 
 def delete_dataset(conn: sqlite3.Connection, dataset_id: int):
     """Delete dataset by id. Returns number of deleted rows."""
     cursor = conn.cursor()
     cursor.execute("DELETE FROM datasets_metadata WHERE id = ?", (dataset_id,))
     conn.commit()
+    bump_table_version("datasets_metadata")
     return cursor.rowcount
 
-def load_datasets_metadata_csv(conn, csv_filename="datasets_metadata_1000.csv", force: bool = False):
+def load_datasets_metadata_csv(conn, csv_filename="datasets_metadata_1000.csv", force: bool = False,
+                               incremental: bool = False):
     """
     Load datasets metadata CSV into datasets_metadata table.
     CSV columns (Week 8): id, name, source, category, size
     Mapped to Week 9 columns:
     dataset_name, category, source, last_updated, record_count, file_size_mb
+    incremental=True applies only inserts/updates/deletes since the last
+    load, keyed on the CSV id (see app/data/sync.py).
     """
 
     create_datasets_metadata_table(conn)
@@ -66,27 +78,11 @@ def load_datasets_metadata_csv(conn, csv_filename="datasets_metadata_1000.csv",
         print(f"CSV not found: {csv_path}")
         return 0
 
-    df = pd.read_csv(csv_path)
-    df.columns = df.columns.str.strip().str.lower()
-
-    df = df.rename(columns={
-        "name": "dataset_name",
-        "size": "file_size_mb"
-    })
-
-    df["last_updated"] = "2024-01-01"        # placeholder
-    df["record_count"] = 0                  # placeholder
-
-    final_cols = [
-        "dataset_name",
-        "category",
-        "source",
-        "last_updated",
-        "record_count",
-        "file_size_mb"
-    ]
-
-    df = df[final_cols]
+    if incremental:
+        stats = sync_csv(conn, "datasets_metadata", csv_path)
+        print(f"Synced datasets_metadata from CSV: {stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged, {stats['adopted']} adopted")
+        return stats["inserted"] + stats["updated"]
 
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(1) FROM datasets_metadata")
@@ -95,12 +91,10 @@ def load_datasets_metadata_csv(conn, csv_filename="datasets_metadata_1000.csv",
         if not force:
             print(f"datasets_metadata already has {existing} rows; skipping CSV load (use force=True to overwrite)")
             return 0
-        else:
-            cursor.execute("DELETE FROM datasets_metadata")
-            conn.commit()
-            print("Existing datasets_metadata rows deleted (force=True).")
+        print("Replacing existing datasets_metadata rows (force=True).")
 
-    df.to_sql("datasets_metadata", conn, if_exists="append", index=False)
+    # last_updated / record_count are placeholders (see ingest._dataset_row)
+    stats = ingest_csv(conn, "datasets_metadata", csv_path, replace=existing > 0)
 
-    print(f"Loaded {len(df)} dataset rows!")
-    return len(df)
\ No newline at end of file
+    print(f"Loaded {stats['rows']} dataset rows! ({stats['rows_per_sec']:,.0f} rows/s)")
+    return stats["rows"]
\ No newline at end of file
@@ -1,8 +1,207 @@
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 DB_PATH = Path("DATA") / "intelligence_platform.db"
 
+# Seconds a statement waits on a locked database before "database is locked".
+BUSY_TIMEOUT = 5.0
+
+# Upper bound on simultaneously open connections per database file.
+MAX_CONNECTIONS = 8
+
+PRAGMAS = (
+    ("journal_mode", "WAL"),        # readers no longer block the writer
+    ("synchronous", "NORMAL"),      # fsync at checkpoints only (safe with WAL)
+    ("cache_size", -32000),         # negative = KiB, ~32 MB page cache
+    ("mmap_size", 268435456),       # 256 MB memory-mapped reads
+    ("temp_store", "MEMORY"),
+)
+
+
+class Connection(sqlite3.Connection):
+    """sqlite3.Connection that remembers the database file it has open."""
+
+    _db_file = None
+
+    @property
+    def db_file(self):
+        if self._db_file is None:
+            self._db_file = _main_file(self)
+        return self._db_file
+
+
+def _main_file(conn: sqlite3.Connection):
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA database_list")
+    return next((row[2] for row in cursor.fetchall() if row[1] == "main"), "")
+
+
+def database_file(conn: sqlite3.Connection):
+    """
+    Absolute path of conn's main database ("" for in-memory/temporary
+    databases). Asked of SQLite once per connection opened here.
+    """
+    if isinstance(conn, Connection):
+        return conn.db_file
+    return _main_file(conn)
+
+
+def _configure(conn: sqlite3.Connection):
+    """Apply busy timeout and performance pragmas to a new connection."""
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+    for name, value in PRAGMAS:
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+    return conn
+
+
 def connect_database(db_path=DB_PATH):
-    """Connect to SQLite database."""
-    return sqlite3.connect(str(db_path))
\ No newline at end of file
+    """Connect to SQLite database (unpooled; caller must close it)."""
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT, factory=Connection)
+    return _configure(conn)
+
+
+class ConnectionPool:
+    """
+    Reusable SQLite connections for one database file.
+
+    A thread that already holds a connection gets the same one back on
+    nested checkouts. Otherwise an idle connection is reused, a new one is
+    opened while under max_connections, or the caller waits for a release.
+    """
+
+    def __init__(self, db_path=DB_PATH, max_connections: int = MAX_CONNECTIONS):
+        self.db_path = str(db_path)
+        self.max_connections = max_connections
+        self._idle = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self.stats = {
+            "opened": 0,
+            "checkouts": 0,
+            "reused": 0,
+            "waits": 0,
+            "wait_time_s": 0.0,
+        }
+
+    def _acquire(self, timeout: float):
+        with self._cond:
+            started = None
+            while not self._idle and self._open >= self.max_connections:
+                if started is None:
+                    started = time.perf_counter()
+                    self.stats["waits"] += 1
+                remaining = timeout - (time.perf_counter() - started)
+                if remaining <= 0:
+                    self.stats["wait_time_s"] += time.perf_counter() - started
+                    raise sqlite3.OperationalError("timed out waiting for a pooled connection")
+                self._cond.wait(remaining)
+            if started is not None:
+                self.stats["wait_time_s"] += time.perf_counter() - started
+
+            self.stats["checkouts"] += 1
+            if self._idle:
+                self.stats["reused"] += 1
+                return self._idle.pop()
+            self._open += 1
+            self.stats["opened"] += 1
+
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False,
+                                   factory=Connection)
+            return _configure(conn)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, conn: sqlite3.Connection):
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float = BUSY_TIMEOUT):
+        """
+        Check out a connection for the current thread.
+        Commits on clean exit, rolls back on error, then returns it to the pool.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            with self._cond:
+                self.stats["checkouts"] += 1
+                self.stats["reused"] += 1
+            yield held
+            return
+
+        conn = self._acquire(timeout)
+        self._local.conn = conn
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close(self):
+        """Close every idle connection (checked-out ones are left alone)."""
+        with self._cond:
+            while self._idle:
+                self._idle.pop().close()
+                self._open -= 1
+
+    def snapshot(self):
+        """Return a copy of the counters plus current open/idle sizes."""
+        with self._cond:
+            stats = dict(self.stats)
+            stats["open"] = self._open
+            stats["idle"] = len(self._idle)
+        return stats
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=DB_PATH):
+    """Return the shared pool for db_path, creating it on first use."""
+    key = str(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path)
+        return pool
+
+
+def get_connection(db_path=DB_PATH):
+    """
+    Context manager yielding a pooled connection:
+
+        with get_connection() as conn:
+            get_all_incidents(conn)
+    """
+    return get_pool(db_path).connection()
+
+
+def pool_stats(db_path=DB_PATH):
+    """Open/checkout/wait-time counters for the pool serving db_path."""
+    return get_pool(db_path).snapshot()
+
+
+def close_all_pools():
+    """Close idle connections in every pool (e.g. on shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
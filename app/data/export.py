@@ -0,0 +1,152 @@
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+import zlib
+
+from .schema import declared_kind, public_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+# Rows fetched from SQLite (and encoded) per step; bounds export memory.
+CHUNK_ROWS = 5000
+
+# Tables that may be exported, in id order.
+EXPORTABLE = ("cyber_incidents", "it_tickets", "datasets_metadata")
+
+# format -> (mime type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "csv.gz": ("application/gzip", ".csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def available_formats():
+    """Export formats usable here (parquet needs pyarrow)."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pq is not None]
+
+
+def iter_chunks(conn: sqlite3.Connection, table: str, chunk_rows: int = CHUNK_ROWS):
+    """
+    Yield (columns, rows) for table's user-facing columns (public_columns)
+    in id order, chunk_rows at a time.
+    """
+    if table not in EXPORTABLE:
+        raise ValueError(f"cannot export {table!r}; choose from {EXPORTABLE}")
+    columns = list(public_columns(conn, table))
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        yield columns, rows
+
+
+def iter_csv(conn: sqlite3.Connection, table: str, chunk_rows: int = CHUNK_ROWS):
+    """Yield the table as UTF-8 CSV bytes, header first, one chunk of rows per piece."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    header_written = False
+    for columns, rows in iter_chunks(conn, table, chunk_rows):
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if not header_written:
+        # empty table: still emit the header
+        writer.writerow(public_columns(conn, table))
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_csv_gzip(conn: sqlite3.Connection, table: str, chunk_rows: int = CHUNK_ROWS):
+    """iter_csv() compressed on the fly into a single gzip stream."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for piece in iter_csv(conn, table, chunk_rows):
+        out = compressor.compress(piece)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _scalar_or_none(value, type_):
+    try:
+        return pa.scalar(value, type=type_).as_py()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError, TypeError):
+        return None
+
+
+def _arrow_column(values, type_):
+    """
+    Arrow array of type_ for one column. SQLite's mixed-type columns are
+    stringified in string columns; values that do not fit a numeric
+    type_ become null.
+    """
+    try:
+        return pa.array(values, type=type_)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if pa.types.is_string(type_):
+            return pa.array([None if v is None else str(v) for v in values], type=type_)
+        return pa.array([_scalar_or_none(v, type_) for v in values], type=type_)
+
+
+def _parquet_schema(conn: sqlite3.Connection, table: str, columns):
+    """Arrow schema for columns of table, from their declared SQLite types."""
+    arrow_types = {"integer": pa.int64(), "real": pa.float64(), "text": pa.string()}
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA table_xinfo({table})")
+    kinds = {row[1]: declared_kind(row[2]) for row in cursor.fetchall()}
+    return pa.schema([(c, arrow_types[kinds.get(c, "text")]) for c in columns])
+
+
+def write_parquet(conn: sqlite3.Connection, table: str, path, chunk_rows: int = CHUNK_ROWS):
+    """
+    Write the table to a Parquet file at path, one row group per chunk.
+    Column types come from the table's declared types, so they do not
+    depend on which values happen to come first.
+    """
+    if pq is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    schema = _parquet_schema(conn, table, public_columns(conn, table))
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for _, rows in iter_chunks(conn, table, chunk_rows):
+            arrays = [_arrow_column(v, f.type) for v, f in zip(zip(*rows), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+def export_table(conn: sqlite3.Connection, table: str, fmt: str = "csv",
+                 path=None, chunk_rows: int = CHUNK_ROWS):
+    """
+    Stream table into a file in the given format (see EXPORT_FORMATS)
+    without holding more than chunk_rows rows in memory. With no path a
+    temporary file is created; the caller owns (and deletes) it.
+    Returns the file path.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; choose from {tuple(EXPORT_FORMATS)}")
+    created = path is None
+    if created:
+        fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=EXPORT_FORMATS[fmt][1])
+        os.close(fd)
+    try:
+        if fmt == "parquet":
+            write_parquet(conn, table, path, chunk_rows)
+        else:
+            pieces = iter_csv_gzip if fmt == "csv.gz" else iter_csv
+            with open(path, "wb") as f:
+                for piece in pieces(conn, table, chunk_rows):
+                    f.write(piece)
+    except Exception:
+        if created:
+            os.remove(path)
+        raise
+    return path
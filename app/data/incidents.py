@@ -2,11 +2,20 @@ import pandas as pd
 from pathlib import Path
 import sqlite3
 
-from .db import connect_database
+from .cache import bump_table_version
 from .schema import create_cyber_incidents_table
+from .batch import normalize_rows, existing_ids, run_batch, align_ids
+from .paging import fetch_page
+from .updates import update_row
+from .search import fts_page
+from .ingest import ingest_csv
+from .sync import sync_csv
+from models import SecurityIncident, model_row_factory
 
 
 DATA_DIR = Path("DATA")  # folder where CSVs live
+
+incident_row = model_row_factory(SecurityIncident)
  
 
 def insert_incident(conn: sqlite3.Connection, title, severity, status="open", date=None):
@@ -20,12 +29,14 @@ def insert_incident(conn: sqlite3.Connection, title, severity, status="open", da
         (title, severity, status, date)
     )
     conn.commit()
+    bump_table_version("cyber_incidents")
     return cursor.lastrowid
 
 
 def get_incident_by_id(conn: sqlite3.Connection, incident_id: int):
-    """Fetch one incident by id."""
+    """Fetch one incident by id as a SecurityIncident (None if missing)."""
     cursor = conn.cursor()
+    cursor.row_factory = incident_row
     cursor.execute(
         "SELECT * FROM cyber_incidents WHERE id = ?",
         (incident_id,)
@@ -34,39 +45,63 @@ def get_incident_by_id(conn: sqlite3.Connection, incident_id: int):
 
 
 def get_all_incidents(conn: sqlite3.Connection):
-    """Fetch all incidents."""
+    """Fetch all incidents as SecurityIncident objects."""
     cursor = conn.cursor()
+    cursor.row_factory = incident_row
     cursor.execute("SELECT * FROM cyber_incidents")
     return cursor.fetchall()
 
 
-def update_incident(conn, incident_id, title=None, severity=None, status=None, date=None):
-    cursor = conn.cursor()
-
-    current = get_incident_by_id(conn, incident_id)
-    if not current:
-        return False
+def get_incidents_page(conn: sqlite3.Connection, after=None, page_size: int = 50,
+                       sort: str = "date", descending: bool = True,
+                       status=None, severity=None, category=None):
+    """
+    Fetch one page of incidents using keyset pagination.
+    sort: "date" or "id". status/severity/category: a value or list of values
+    (category filters the classified incident_category).
+    Pass the returned next_cursor as `after` to get the following page.
+    """
+    return fetch_page(
+        conn, "cyber_incidents",
+        sort=sort, descending=descending, after=after, page_size=page_size,
+        filters={"status": status, "severity": severity, "incident_category": category},
+        sortable=("id", "date"),
+        filterable=("status", "severity", "incident_category")
+    )
 
-    new_title = title if title is not None else current[1]
-    new_severity = severity if severity is not None else current[2]
-    new_status = status if status is not None else current[3]
-    new_date = date if date is not None else current[4]
 
-    prev_status = current[3] if len(current) > 3 else None
-    prev_resolved = current[5] if len(current) > 5 else None
-    resolved_date = prev_resolved
-    if prev_status != "Closed" and new_status == "Closed":
-        from datetime import datetime
-        resolved_date = datetime.utcnow().strftime("%Y-%m-%d")
+def search_incidents(conn: sqlite3.Connection, text: str, after=None, page_size: int = 50,
+                     status=None, severity=None, category=None):
+    """
+    Full-text search over incident titles and their classified category
+    (FTS5 index from schema migration 7), best match first; words match
+    as prefixes. category filters on incident_category.
+    Returns a page dict like get_incidents_page.
+    """
+    return fts_page(
+        conn, "cyber_incidents", "cyber_incidents_fts", text,
+        after=after, page_size=page_size,
+        filters={"status": status, "severity": severity, "incident_category": category}
+    )
 
-    cursor.execute("""
-        UPDATE cyber_incidents
-        SET title = ?, severity = ?, status = ?, date = ?, resolved_date = ?
-        WHERE id = ?
-    """, (new_title, new_severity, new_status, new_date, resolved_date, incident_id))
 
+def update_incident(conn: sqlite3.Connection, incident_id: int,
+                    title=None, severity=None, status=None, date=None):
+    """
+    Update only the supplied fields, in one UPDATE with no prior read.
+    A transition to "Closed" stamps resolved_date (today, UTC) in the
+    same statement. Returns False if the incident does not exist.
+    """
+    from datetime import datetime
+    found = update_row(
+        conn, "cyber_incidents", incident_id,
+        {"title": title, "severity": severity, "status": status, "date": date},
+        closed_status="Closed", resolved_value=datetime.utcnow().strftime("%Y-%m-%d")
+    )
     conn.commit()
-    return True
+    if found:
+        bump_table_version("cyber_incidents")
+    return found
 
 
 def delete_incident(conn: sqlite3.Connection, incident_id: int):
@@ -77,15 +112,89 @@ def delete_incident(conn: sqlite3.Connection, incident_id: int):
         (incident_id,)
     )
     conn.commit()
+    bump_table_version("cyber_incidents")
     return cursor.rowcount
 
 
+INCIDENT_FIELDS = ("title", "severity", "status", "date")
 
 
-def load_cyber_incidents_csv(conn: sqlite3.Connection, csv_filename="cyber_incidents_1000.csv", force: bool = False):
+def insert_incidents_many(conn: sqlite3.Connection, rows):
+    """
+    Insert many incidents in one transaction.
+    rows: dicts with INCIDENT_FIELDS keys, or (title, severity, status, date) tuples.
+    Returns (ids, errors): ids lines up with rows (None for failed rows),
+    errors is a list of (row_index, message).
+    """
+    params, errors = normalize_rows(rows, INCIDENT_FIELDS, required=("title", "severity", "date"))
+    params = [(i, (t, sev, st if st is not None else "open", d)) for i, (t, sev, st, d) in params]
+    ids, run_errors = run_batch(
+        conn,
+        "INSERT INTO cyber_incidents (title, severity, status, date) VALUES (?, ?, ?, ?)",
+        params,
+        returning_ids=True
+    )
+    bump_table_version("cyber_incidents")
+    return align_ids(len(rows), params, ids), sorted(errors + run_errors)
+
+
+def update_incidents_many(conn: sqlite3.Connection, updates):
+    """
+    Apply many incident updates in one transaction.
+    updates: dicts with "id" plus any of INCIDENT_FIELDS; missing/None fields
+    keep their current value. resolved_date is stamped on a transition to
+    "Closed", as in update_incident.
+    Returns (updated_count, errors).
+    """
+    params, errors = normalize_rows(updates, ("id",) + INCIDENT_FIELDS, required=("id",))
+    found = existing_ids(conn, "cyber_incidents", [p[0] for _, p in params])
+    errors += [(i, f"incident {p[0]} not found") for i, p in params if p[0] not in found]
+
+    from datetime import datetime
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    params = [
+        (i, (title, severity, status, date, status, today, incident_id))
+        for i, (incident_id, title, severity, status, date) in params
+        if incident_id in found
+    ]
+    updated, run_errors = run_batch(conn, """
+        UPDATE cyber_incidents
+        SET title = COALESCE(?, title),
+            severity = COALESCE(?, severity),
+            status = COALESCE(?, status),
+            date = COALESCE(?, date),
+            resolved_date = CASE
+                WHEN ? = 'Closed' AND COALESCE(status, '') != 'Closed' THEN ?
+                ELSE resolved_date
+            END
+        WHERE id = ?
+    """, params)
+    bump_table_version("cyber_incidents")
+    return updated, sorted(errors + run_errors)
+
+
+def delete_incidents_many(conn: sqlite3.Connection, incident_ids):
+    """
+    Delete many incidents in one transaction.
+    Returns (deleted_count, errors); unknown ids are reported as errors.
+    """
+    params, errors = normalize_rows([(x,) for x in incident_ids], ("id",), required=("id",))
+    found = existing_ids(conn, "cyber_incidents", [p[0] for _, p in params])
+    errors += [(i, f"incident {p[0]} not found") for i, p in params if p[0] not in found]
+    params = [(i, p) for i, p in params if p[0] in found]
+    deleted, run_errors = run_batch(conn, "DELETE FROM cyber_incidents WHERE id = ?", params)
+    bump_table_version("cyber_incidents")
+    return deleted, sorted(errors + run_errors)
+
+
+def load_cyber_incidents_csv(conn: sqlite3.Connection, csv_filename="cyber_incidents_1000.csv", force: bool = False,
+                             incremental: bool = False):
     """
     Load cyber incidents from CSV into cyber_incidents table.
     CSV columns expected: id,title,severity,status,date
+    The file is streamed in chunks (see app/data/ingest.py).
+    incremental=True applies only inserts/updates/deletes since the last
+    load, keyed on the CSV id (see app/data/sync.py).
     """
     # ensure table exists
     create_cyber_incidents_table(conn)
@@ -96,13 +205,11 @@ def load_cyber_incidents_csv(conn: sqlite3.Connection, csv_filename="cyber_incid
         print(f" CSV not found: {csv_path}")
         return 0
 
-    df = pd.read_csv(csv_path)
-    df.columns = df.columns.str.strip()  # clean headers
-
-    expected_cols = ["id", "title", "severity", "status", "date"]
-    df = df[expected_cols]
-
-    df = df.drop(columns=["id"])
+    if incremental:
+        stats = sync_csv(conn, "cyber_incidents", csv_path)
+        print(f"Synced cyber_incidents from CSV: {stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged, {stats['adopted']} adopted")
+        return stats["inserted"] + stats["updated"]
 
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(1) FROM cyber_incidents")
@@ -111,12 +218,9 @@ def load_cyber_incidents_csv(conn: sqlite3.Connection, csv_filename="cyber_incid
         if not force:
             print(f"cyber_incidents already has {existing} rows; skipping CSV load (use force=True to overwrite)")
             return 0
-        else:
-            cursor.execute("DELETE FROM cyber_incidents")
-            conn.commit()
-            print("Existing cyber_incidents rows deleted (force=True).")
+        print("Replacing existing cyber_incidents rows (force=True).")
 
-    df.to_sql("cyber_incidents", conn, if_exists="append", index=False)
+    stats = ingest_csv(conn, "cyber_incidents", csv_path, replace=existing > 0)
 
-    print(f"Loaded {len(df)} rows into cyber_incidents")
-    return len(df)
+    print(f"Loaded {stats['rows']} rows into cyber_incidents ({stats['rows_per_sec']:,.0f} rows/s)")
+    return stats["rows"]
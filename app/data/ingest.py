@@ -0,0 +1,169 @@
+import csv
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+from .cache import bump_table_version
+from .schema import table_columns
+
+# Rows per executemany call; memory use is bounded by this, not file size.
+CHUNK_SIZE = 5000
+
+
+def _clean(value):
+    """CSV gives '' for missing cells; store those as NULL."""
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+def _to_float(value):
+    value = _clean(value)
+    return float(value) if value is not None else None
+
+
+def row_hash(row):
+    """Stable content hash of a mapped CSV row."""
+    text = "\x1f".join("" if v is None else str(v) for v in row)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def source_key(rec, row):
+    """A CSV row's identity: its id column, or its content hash if there is none."""
+    key = _clean(rec.get("id"))
+    return key if key is not None else row_hash(row)
+
+
+def has_source_columns(conn: sqlite3.Connection, table: str):
+    """True once schema migration 3 has added source_key/source_hash."""
+    return "source_key" in table_columns(conn, table)
+
+
+def _incident_row(rec):
+    return (_clean(rec.get("title")), _clean(rec.get("severity")),
+            _clean(rec.get("status")), _clean(rec.get("date")))
+
+
+def _ticket_row(rec):
+    return (_clean(rec.get("title")), _clean(rec.get("priority")),
+            _clean(rec.get("status")), _clean(rec.get("created_date")),
+            _clean(rec.get("assigned_to")))
+
+
+def _dataset_row(rec):
+    # Week 8 CSV: id, name, source, category, size -> Week 9 columns
+    return (_clean(rec.get("name")), _clean(rec.get("category")), _clean(rec.get("source")),
+            "2024-01-01",                   # last_updated placeholder
+            0,                              # record_count placeholder
+            _to_float(rec.get("size")))
+
+
+# table -> (required CSV headers, insert columns, CSV record -> parameter
+# tuple). The CSV id column is never copied so SQLite assigns ids.
+INGEST_SPECS = {
+    "cyber_incidents": (
+        ("title", "severity", "status", "date"),
+        ("title", "severity", "status", "date"),
+        _incident_row
+    ),
+    "it_tickets": (
+        ("title", "priority", "status", "created_date"),
+        ("title", "priority", "status", "created_date", "assigned_to"),
+        _ticket_row
+    ),
+    "datasets_metadata": (
+        ("name", "source", "category", "size"),
+        ("dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb"),
+        _dataset_row
+    ),
+}
+
+
+def stream_csv(csv_path, chunk_size: int = CHUNK_SIZE, required=()):
+    """
+    Yield lists of up to chunk_size records (dicts) from a CSV file.
+    Headers are stripped and lower-cased; ValueError if a required one is missing.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [h.strip().lower() for h in header]
+        missing = [c for c in required if c not in header]
+        if missing:
+            raise ValueError(f"{csv_path} is missing column(s): {', '.join(missing)}")
+        chunk = []
+        for values in reader:
+            if not values:
+                continue
+            chunk.append(dict(zip(header, values)))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def insert_sql(conn: sqlite3.Connection, table: str):
+    """
+    (INSERT statement, keyed) for rows produced by INGEST_SPECS[table].
+    keyed tables take source_key/source_hash as two extra values per row.
+    """
+    _, columns, _ = INGEST_SPECS[table]
+    keyed = has_source_columns(conn, table)
+    if keyed:
+        columns = columns + ("source_key", "source_hash")
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    if keyed:
+        # a repeated CSV id / identical row is loaded once
+        sql += " ON CONFLICT (source_key) DO NOTHING"
+    return sql, keyed
+
+
+def ingest_csv(conn: sqlite3.Connection, table: str, csv_path, chunk_size: int = CHUNK_SIZE,
+               replace: bool = False):
+    """
+    Stream csv_path into table in one transaction with a prepared INSERT.
+    replace=True deletes existing rows first (inside the same transaction).
+    Rows are stamped with source_key/source_hash when the table has them,
+    so a later sync_csv can diff against this load.
+
+    Returns {"rows", "chunks", "seconds", "rows_per_sec"}.
+    Raises on error after rolling the whole load back.
+    """
+    required, _, to_row = INGEST_SPECS[table]
+    sql, keyed = insert_sql(conn, table)
+
+    start = time.perf_counter()
+    rows = chunks = 0
+    if conn.in_transaction:
+        conn.commit()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    try:
+        if replace:
+            cursor.execute(f"DELETE FROM {table}")
+        for chunk in stream_csv(Path(csv_path), chunk_size, required):
+            rows_out = [to_row(rec) for rec in chunk]
+            if keyed:
+                rows_out = [row + (source_key(rec, row), row_hash(row)) for rec, row in zip(chunk, rows_out)]
+            cursor.executemany(sql, rows_out)
+            rows += cursor.rowcount
+            chunks += 1
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        bump_table_version(table)
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else 0.0,
+    }
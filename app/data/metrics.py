@@ -0,0 +1,177 @@
+import sqlite3
+
+import pandas as pd
+
+from .schema import table_columns
+
+# Headline numbers for the dashboards, computed with GROUP BY / SUM in SQLite
+# so a render reads a handful of rows no matter how large the tables get.
+
+
+def _group_counts(conn: sqlite3.Connection, table: str, column: str):
+    """Return {value: count} for one column."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {column}, COUNT(*) FROM {table} GROUP BY {column}")
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def _count_ci(counts: dict, value: str):
+    """Sum the counts whose key equals value case-insensitively."""
+    return sum(n for key, n in counts.items() if key is not None and str(key).lower() == value)
+
+
+def _phishing_filter(cols):
+    """
+    SQL condition for phishing incidents: an indexed lookup on the
+    classified incident_category (schema migration 7), else a LIKE scan.
+    """
+    if "incident_category" in cols:
+        return "incident_category = 'phishing'"
+    column = "category" if "category" in cols else "title"
+    return f"{column} LIKE '%phish%'"
+
+
+def phishing_count(conn: sqlite3.Connection):
+    """Count incidents classified as phishing."""
+    cols = table_columns(conn, "cyber_incidents")
+    if not cols:
+        return 0
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM cyber_incidents WHERE {_phishing_filter(cols)}")
+    return cursor.fetchone()[0]
+
+
+def incident_kpis(conn: sqlite3.Connection):
+    """Totals, open/high counts, phishing count and per-status/severity/category counts."""
+    cols = table_columns(conn, "cyber_incidents")
+    if not cols:
+        return {"total": 0, "open": 0, "high": 0, "phishing": 0,
+                "by_status": {}, "by_severity": {}, "by_category": {}}
+
+    by_status = _group_counts(conn, "cyber_incidents", "status")
+    by_severity = _group_counts(conn, "cyber_incidents", "severity")
+    if "incident_category" in cols:
+        by_category = _group_counts(conn, "cyber_incidents", "incident_category")
+        phishing = by_category.get("phishing", 0)
+    else:
+        by_category = {}
+        phishing = phishing_count(conn)
+    return {
+        "total": sum(by_status.values()),
+        "open": _count_ci(by_status, "open"),
+        "high": _count_ci(by_severity, "high"),
+        "phishing": phishing,
+        "by_status": by_status,
+        "by_severity": by_severity,
+        "by_category": by_category,
+    }
+
+
+def ticket_kpis(conn: sqlite3.Connection):
+    """Totals, open/waiting counts and per-status/priority counts."""
+    if not table_columns(conn, "it_tickets"):
+        return {"total": 0, "open": 0, "waiting_user": 0, "by_status": {}, "by_priority": {}}
+
+    by_status = _group_counts(conn, "it_tickets", "status")
+    return {
+        "total": sum(by_status.values()),
+        "open": _count_ci(by_status, "open"),
+        "waiting_user": _count_ci(by_status, "waiting_user"),
+        "by_status": by_status,
+        "by_priority": _group_counts(conn, "it_tickets", "priority"),
+    }
+
+
+def dataset_kpis(conn: sqlite3.Connection):
+    """Dataset count, total size (MB) and total record count."""
+    if not table_columns(conn, "datasets_metadata"):
+        return {"total": 0, "total_mb": 0.0, "total_records": 0}
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COUNT(*), COALESCE(SUM(file_size_mb), 0), COALESCE(SUM(record_count), 0)
+        FROM datasets_metadata
+    """)
+    total, total_mb, total_records = cursor.fetchone()
+    return {"total": total, "total_mb": float(total_mb), "total_records": total_records}
+
+
+def dashboard_kpis(conn: sqlite3.Connection):
+    """All headline KPIs for the main dashboard."""
+    return {
+        "incidents": incident_kpis(conn),
+        "tickets": ticket_kpis(conn),
+        "datasets": dataset_kpis(conn),
+    }
+
+
+def _day_series(rows):
+    return pd.Series(
+        [r[1] for r in rows],
+        index=pd.to_datetime([r[0] for r in rows]),
+        name="count",
+        dtype="int64"
+    )
+
+
+def _rollup_per_day(conn: sqlite3.Connection, rollup: str, filters):
+    where, params = [], []
+    for column, value in filters.items():
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT day, SUM(count) FROM {rollup} {where_sql} GROUP BY day ORDER BY day", params
+    )
+    return _day_series(cursor.fetchall())
+
+
+def incidents_per_day(conn: sqlite3.Connection, phishing_only: bool = False):
+    """
+    Incident counts per calendar day as a Series indexed by date.
+    Read from incident_daily_rollup (O(days) rows) once schema migration 8
+    has created it; otherwise grouped from cyber_incidents.
+    """
+    if table_columns(conn, "incident_daily_rollup"):
+        return _rollup_per_day(conn, "incident_daily_rollup",
+                               {"incident_category": "phishing" if phishing_only else None})
+
+    cols = table_columns(conn, "cyber_incidents")
+    if not cols:
+        return pd.Series(dtype="int64", name="count")
+
+    where = ""
+    if phishing_only:
+        where = f"AND {_phishing_filter(cols)}"
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT date(date) AS day, COUNT(*)
+        FROM cyber_incidents
+        WHERE date(date) IS NOT NULL {where}
+        GROUP BY day
+        ORDER BY day
+    """)
+    return _day_series(cursor.fetchall())
+
+
+def tickets_per_day(conn: sqlite3.Connection, priority=None, status=None):
+    """Tickets created per calendar day (from ticket_daily_rollup) as a Series."""
+    if not table_columns(conn, "ticket_daily_rollup"):
+        return pd.Series(dtype="int64", name="count")
+    return _rollup_per_day(conn, "ticket_daily_rollup", {"priority": priority, "status": status})
+
+
+def daily_spikes(per_day: pd.Series, window: int = 7, factor: float = 2.0):
+    """
+    Fill missing days with 0 and flag spikes: days whose count exceeds
+    factor x the trailing window-day mean. Returns a DataFrame with
+    count, rolling_mean and is_spike.
+    """
+    if per_day.empty:
+        return pd.DataFrame(columns=["count", "rolling_mean", "is_spike"])
+    daily = per_day.to_frame("count").asfreq("D", fill_value=0)
+    daily["rolling_mean"] = daily["count"].rolling(window=window, min_periods=1).mean()
+    daily["is_spike"] = daily["count"] > (daily["rolling_mean"] * factor)
+    return daily
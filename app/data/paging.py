@@ -0,0 +1,73 @@
+import sqlite3
+
+from .schema import public_columns
+
+
+def fetch_page(conn: sqlite3.Connection, table: str, *, sort="id", descending=True,
+               filters=None, after=None, page_size=50, sortable=("id",), filterable=(),
+               computed=None):
+    """
+    Keyset-paginated SELECT over table's user-facing columns (public_columns),
+    plus computed, a {name: SQL expression} of derived columns.
+
+    Rows are ordered by (sort, id) so pages are stable even when sort values
+    repeat. after is the next_cursor of the previous page, a (sort_value, id)
+    pair; the query seeks past it with a row-value comparison instead of
+    OFFSET, so every page costs the same regardless of depth.
+
+    filters maps column -> value (or a list of values); None values are ignored.
+
+    Returns a dict: rows, columns, next_cursor (None on the last page), has_more.
+    """
+    if sort not in sortable:
+        raise ValueError(f"cannot sort {table} by {sort!r}; choose from {sortable}")
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    where, params = [], []
+    for column, value in (filters or {}).items():
+        if column not in filterable:
+            raise ValueError(f"cannot filter {table} on {column!r}; choose from {filterable}")
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if not values:
+                continue
+            where.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            where.append(f"{column} = ?")
+            params.append(value)
+
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+    if sort == "id":
+        order_by = f"id {direction}"
+        if after is not None:
+            where.append(f"id {op} ?")
+            params.append(after[-1])
+    else:
+        order_by = f"{sort} {direction}, id {direction}"
+        if after is not None:
+            where.append(f"({sort}, id) {op} (?, ?)")
+            params.extend(after)
+
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    cursor = conn.cursor()
+    select = list(public_columns(conn, table))
+    select += [f"{expr} AS {name}" for name, expr in (computed or {}).items()]
+    cursor.execute(
+        f"SELECT {', '.join(select)} FROM {table} {where_sql} ORDER BY {order_by} LIMIT ?",
+        params + [page_size + 1]
+    )
+    rows = cursor.fetchall()
+    columns = [d[0] for d in cursor.description]
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = (last[columns.index(sort)], last[columns.index("id")])
+
+    return {"rows": rows, "columns": columns, "next_cursor": next_cursor, "has_more": has_more}
@@ -0,0 +1,158 @@
+"""
+EXPLAIN QUERY PLAN check for every query the app issues.
+
+    python -m app.data.query_plans            # fresh in-memory schema
+    python -m app.data.query_plans DATA/intelligence_platform.db
+
+Exits non-zero if a query marked hot does a full table scan.
+"""
+import re
+import sqlite3
+import sys
+
+from .db import connect_database
+from .schema import create_all_tables
+
+# (name, sql, params, hot). hot=False marks intentional whole-table reads
+# (exports, CSV reload checks); they are reported but never fail the check.
+APP_QUERIES = [
+    # users
+    ("user by username", "SELECT * FROM users WHERE username = ?", ("alice",), True),
+
+    # incidents
+    ("incident by id", "SELECT * FROM cyber_incidents WHERE id = ?", (1,), True),
+    ("update incident", "UPDATE cyber_incidents SET status = ? WHERE id = ?", ("Closed", 1), True),
+    ("delete incident", "DELETE FROM cyber_incidents WHERE id = ?", (1,), True),
+    ("incidents newest first", "SELECT * FROM cyber_incidents ORDER BY date DESC", (), True),
+    ("incidents by status", "SELECT * FROM cyber_incidents WHERE status = ?", ("open",), True),
+    ("incidents by severity, newest first",
+     "SELECT * FROM cyber_incidents WHERE severity = ? ORDER BY date DESC", ("High",), True),
+    ("incident counts by status/severity",
+     "SELECT status, severity, COUNT(*) FROM cyber_incidents GROUP BY status, severity", (), True),
+    ("incidents in date range",
+     "SELECT * FROM cyber_incidents WHERE date BETWEEN ? AND ?", ("2024-01-01", "2024-12-31"), True),
+    ("incidents per day",
+     "SELECT date(date) AS day, COUNT(*) FROM cyber_incidents WHERE date(date) IS NOT NULL GROUP BY day",
+     (), True),
+    ("incident sample, newest first", "SELECT * FROM cyber_incidents ORDER BY date DESC LIMIT 20", (), True),
+    ("incident page, newest first",
+     "SELECT * FROM cyber_incidents WHERE (date, id) < (?, ?) ORDER BY date DESC, id DESC LIMIT ?",
+     ("2024-01-01", 1, 51), True),
+    ("incident page by status",
+     "SELECT * FROM cyber_incidents WHERE status = ? AND (date, id) < (?, ?) ORDER BY date DESC, id DESC LIMIT ?",
+     ("open", "2024-01-01", 1, 51), True),
+    ("phishing count", "SELECT COUNT(*) FROM cyber_incidents WHERE incident_category = 'phishing'", (), True),
+    ("incident counts by category",
+     "SELECT incident_category, COUNT(*) FROM cyber_incidents GROUP BY incident_category", (), True),
+    ("phishing per day",
+     "SELECT date(date) AS day, COUNT(*) FROM cyber_incidents "
+     "WHERE date(date) IS NOT NULL AND incident_category = 'phishing' GROUP BY day", (), True),
+    ("incident page by category",
+     "SELECT * FROM cyber_incidents WHERE incident_category = ? AND (date, id) < (?, ?) "
+     "ORDER BY date DESC, id DESC LIMIT ?", ("phishing", "2024-01-01", 1, 51), True),
+    ("incident search",
+     "SELECT t.*, f.rank FROM cyber_incidents_fts AS f JOIN cyber_incidents AS t ON t.id = f.rowid "
+     "WHERE cyber_incidents_fts MATCH ? AND (f.rank, t.id) > (?, ?) ORDER BY f.rank, t.id LIMIT ?",
+     ('"phish"*', -10.0, 1, 51), True),
+    # rollups hold one row per day x key, so reading them whole is the point
+    ("incidents per day (rollup)",
+     "SELECT day, SUM(count) FROM incident_daily_rollup GROUP BY day ORDER BY day", (), False),
+    ("phishing per day (rollup)",
+     "SELECT day, SUM(count) FROM incident_daily_rollup WHERE incident_category = ? GROUP BY day ORDER BY day",
+     ("phishing",), False),
+    ("incident hashes by CSV key",
+     "SELECT source_key, source_hash FROM cyber_incidents WHERE source_key IN (?, ?)", ("1", "2"), True),
+    ("all incidents", "SELECT * FROM cyber_incidents", (), False),
+    ("incident count", "SELECT COUNT(1) FROM cyber_incidents", (), False),
+
+    # tickets
+    ("ticket by id", "SELECT * FROM it_tickets WHERE id = ?", (1,), True),
+    ("update ticket", "UPDATE it_tickets SET status = ? WHERE id = ?", ("closed", 1), True),
+    ("delete ticket", "DELETE FROM it_tickets WHERE id = ?", (1,), True),
+    ("tickets by status", "SELECT * FROM it_tickets WHERE status = ?", ("open",), True),
+    ("tickets by status and priority",
+     "SELECT * FROM it_tickets WHERE status = ? AND priority = ?", ("open", "high"), True),
+    ("tickets by assignee", "SELECT * FROM it_tickets WHERE assigned_to = ?", ("ops",), True),
+    ("ticket counts by status/priority",
+     "SELECT status, priority, COUNT(*) FROM it_tickets GROUP BY status, priority", (), True),
+    ("tickets by priority, oldest first",
+     "SELECT * FROM it_tickets WHERE priority = ? ORDER BY created_date", ("high",), True),
+    ("ticket page",
+     "SELECT * FROM it_tickets WHERE id < ? ORDER BY id DESC LIMIT ?", (100, 51), True),
+    ("ticket page by status",
+     "SELECT * FROM it_tickets WHERE status = ? AND id < ? ORDER BY id DESC LIMIT ?", ("open", 100, 51), True),
+    ("ticket search",
+     "SELECT t.*, f.rank FROM it_tickets_fts AS f JOIN it_tickets AS t ON t.id = f.rowid "
+     "WHERE it_tickets_fts MATCH ? AND t.status IN (?) AND (f.rank, t.id) > (?, ?) "
+     "ORDER BY f.rank, t.id LIMIT ?",
+     ('"print"*', "open", -10.0, 1, 51), True),
+    ("tickets per day (rollup)",
+     "SELECT day, SUM(count) FROM ticket_daily_rollup WHERE status = ? GROUP BY day ORDER BY day",
+     ("open",), False),
+    ("all tickets newest first", "SELECT * FROM it_tickets ORDER BY id DESC", (), False),
+    ("ticket count", "SELECT COUNT(1) FROM it_tickets", (), False),
+
+    # datasets
+    ("dataset totals",
+     "SELECT COUNT(*), SUM(file_size_mb), SUM(record_count) FROM datasets_metadata", (), False),
+    ("datasets by category", "SELECT * FROM datasets_metadata WHERE category = ?", ("endpoint",), True),
+    ("storage by source",
+     "SELECT source, SUM(file_size_mb) FROM datasets_metadata GROUP BY source", (), True),
+    ("delete dataset", "DELETE FROM datasets_metadata WHERE id = ?", (1,), True),
+    ("all datasets newest first", "SELECT * FROM datasets_metadata ORDER BY id DESC", (), False),
+    ("dataset count", "SELECT COUNT(1) FROM datasets_metadata", (), False),
+]
+
+# "SCAN t" with no index; "SCAN t USING [COVERING] INDEX ..." walks an index
+# and "SCAN f VIRTUAL TABLE INDEX ..." is an FTS lookup, not a table scan.
+_FULL_SCAN = re.compile(r"^SCAN (?!.*\b(?:USING|VIRTUAL TABLE)\b)(\w+)")
+
+
+def explain(conn: sqlite3.Connection, sql: str, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for one query."""
+    cursor = conn.cursor()
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    return [row[3] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    """Tables a plan reads with a full table scan."""
+    return [m.group(1) for m in (_FULL_SCAN.match(line) for line in plan) if m]
+
+
+def check_query_plans(conn: sqlite3.Connection, queries=APP_QUERIES):
+    """
+    Explain every query. Returns (report, failures): report is a list of
+    (name, hot, plan) and failures the names of hot queries that full-scan.
+    """
+    report, failures = [], []
+    for name, sql, params, hot in queries:
+        plan = explain(conn, sql, params)
+        report.append((name, hot, plan))
+        if hot and full_scans(plan):
+            failures.append(name)
+    return report, failures
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    conn = connect_database(argv[0] if argv else ":memory:")
+    if not argv:
+        create_all_tables(conn)
+
+    report, failures = check_query_plans(conn)
+    for name, hot, plan in report:
+        scans = full_scans(plan)
+        tag = "FAIL" if hot and scans else ("scan" if scans else "ok")
+        print(f"[{tag:>4}] {name}: {' | '.join(plan)}")
+    conn.close()
+
+    if failures:
+        print(f"\n{len(failures)} hot query(ies) do a full table scan: {', '.join(failures)}")
+        return 1
+    print("\nNo full table scans on hot paths.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
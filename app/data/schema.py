@@ -1,5 +1,64 @@
+import re
 import sqlite3
 
+from .classify import category_sql
+from .db import database_file
+
+# Bookkeeping columns for CSV sync; never shown in grids, search or exports.
+INTERNAL_COLUMNS = ("source_key", "source_hash")
+
+# (database file, table) -> (frozenset of its column names, user-facing
+# columns in declaration order). Filled by create_all_tables() at startup
+# (or on first use) and dropped whenever DDL here may change a table, so
+# read and write paths never introspect the schema per call. In-memory
+# databases are private to one connection and not cached.
+_table_columns = {}
+
+
+def _column_info(conn: sqlite3.Connection, table: str):
+    db_file = database_file(conn)
+    info = _table_columns.get((db_file, table)) if db_file else None
+    if info is None:
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA table_xinfo({table})")
+        rows = cursor.fetchall()
+        info = (
+            frozenset(row[1] for row in rows),
+            tuple(row[1] for row in rows if row[6] != 1 and row[1] not in INTERNAL_COLUMNS),
+        )
+        if rows and db_file:
+            _table_columns[(db_file, table)] = info
+    return info
+
+
+def table_columns(conn: sqlite3.Connection, table: str):
+    """Column names of table (generated columns included), cached per database file."""
+    return _column_info(conn, table)[0]
+
+
+def public_columns(conn: sqlite3.Connection, table: str):
+    """table's columns in declaration order minus INTERNAL_COLUMNS, cached like table_columns()."""
+    return _column_info(conn, table)[1]
+
+
+def declared_kind(decl: str):
+    """integer/real/text for a declared column type, by SQLite's affinity rules."""
+    decl = (decl or "").upper()
+    if "INT" in decl:
+        return "integer"
+    if any(t in decl for t in ("REAL", "FLOA", "DOUB")):
+        return "real"
+    return "text"
+
+
+def forget_table_columns(*tables):
+    """Drop cached columns for tables (all tables if none given)."""
+    if tables:
+        for key in [k for k in list(_table_columns) if k[1] in tables]:
+            _table_columns.pop(key, None)
+    else:
+        _table_columns.clear()
+
 
 def create_users_table(conn: sqlite3.Connection):
     """Create users table."""
@@ -33,15 +92,15 @@ def create_cyber_incidents_table(conn: sqlite3.Connection):
     conn.commit()
     print("cyber_incidents table created successfully!")
 
-    cursor.execute("PRAGMA table_info(cyber_incidents)")
-    existing_cols = [row[1] for row in cursor.fetchall()]
-    if "resolved_date" not in existing_cols:
+    forget_table_columns("cyber_incidents")
+    if "resolved_date" not in table_columns(conn, "cyber_incidents"):
         try:
             cursor.execute("ALTER TABLE cyber_incidents ADD COLUMN resolved_date TEXT")
             conn.commit()
             print("Added 'resolved_date' column to cyber_incidents (migration)")
         except Exception:
             pass
+        forget_table_columns("cyber_incidents")
 
 
 def create_datasets_metadata_table(conn: sqlite3.Connection):
@@ -79,30 +138,320 @@ def create_it_tickets_table(conn: sqlite3.Connection):
     conn.commit()
     print("it_tickets table created successfully!")
 
-    cursor.execute("PRAGMA table_info(it_tickets)")
-    existing_cols = [row[1] for row in cursor.fetchall()]
-    if "resolved_date" not in existing_cols:
+    forget_table_columns("it_tickets")
+    if "resolved_date" not in table_columns(conn, "it_tickets"):
         try:
             cursor.execute("ALTER TABLE it_tickets ADD COLUMN resolved_date TEXT")
             conn.commit()
             print("Added 'resolved_date' column to it_tickets (migration)")
         except Exception:
             pass
-    cursor.execute("PRAGMA table_info(it_tickets)")
-    existing_cols = [row[1] for row in cursor.fetchall()]
-    if "assigned_to" not in existing_cols:
+        forget_table_columns("it_tickets")
+    if "assigned_to" not in table_columns(conn, "it_tickets"):
         try:
             cursor.execute("ALTER TABLE it_tickets ADD COLUMN assigned_to TEXT")
             conn.commit()
             print("Added 'assigned_to' column to it_tickets (migration)")
         except Exception:
             pass
+        forget_table_columns("it_tickets")
+
+
+def _store_incident_category(cursor: sqlite3.Cursor):
+    """
+    Rebuild cyber_incidents with incident_category as a STORED generated
+    column (computed once per write instead of on every read). SQLite cannot
+    alter a generated column, so the table is copied into a new one built
+    from its own CREATE statement; ids, the AUTOINCREMENT sequence, indexes
+    and triggers are carried over, so FTS and rollups stay valid.
+    """
+    virtual = f"GENERATED ALWAYS AS ({category_sql('title')}) VIRTUAL"
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'cyber_incidents'")
+    table_sql = cursor.fetchone()[0]
+    if virtual not in table_sql:
+        raise sqlite3.OperationalError("cyber_incidents.incident_category is not the migration 7 column")
+    table_sql = table_sql.replace(virtual, virtual[:-len("VIRTUAL")] + "STORED")
+    table_sql = re.sub(r"^CREATE TABLE\s+\"?cyber_incidents\"?", "CREATE TABLE cyber_incidents_rebuild", table_sql)
+
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = 'cyber_incidents' "
+        "AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    )
+    dependents = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'cyber_incidents'")
+    seq = cursor.fetchone()
+    cursor.execute("PRAGMA table_xinfo(cyber_incidents)")
+    columns = ", ".join(row[1] for row in cursor.fetchall() if row[6] == 0)
+
+    cursor.execute(table_sql)
+    cursor.execute(f"INSERT INTO cyber_incidents_rebuild ({columns}) SELECT {columns} FROM cyber_incidents")
+    cursor.execute("DROP TABLE cyber_incidents")
+    cursor.execute("ALTER TABLE cyber_incidents_rebuild RENAME TO cyber_incidents")
+    if seq is not None:
+        cursor.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name = 'cyber_incidents'", seq)
+    for statement in dependents:
+        cursor.execute(statement)
+
+
+def _rollup_statements(table: str, rollup: str, date_col: str, keys, watched):
+    """
+    DDL for a per-day count table over table, keyed by day plus keys, kept
+    current by triggers (+1 on insert, -1/+1 on update of watched columns,
+    -1 on delete) and backfilled from existing rows. NULL keys are stored
+    as '' since primary key columns of a WITHOUT ROWID table are NOT NULL.
+    """
+    key_list = ", ".join(keys)
+    pk = f"day, {key_list}"
+
+    def values(ref):
+        cols = ", ".join(f"COALESCE({ref}.{k}, '')" for k in keys)
+        return f"date({ref}.{date_col}), {cols}"
+
+    def matches(ref):
+        conds = " AND ".join(f"{k} = COALESCE({ref}.{k}, '')" for k in keys)
+        return f"day = date({ref}.{date_col}) AND {conds}"
+
+    def add(ref):
+        return (f"INSERT INTO {rollup} ({pk}, count) SELECT {values(ref)}, 1 "
+                f"WHERE date({ref}.{date_col}) IS NOT NULL "
+                f"ON CONFLICT ({pk}) DO UPDATE SET count = count + 1;")
+
+    def remove(ref):
+        return (f"UPDATE {rollup} SET count = count - 1 WHERE {matches(ref)}; "
+                f"DELETE FROM {rollup} WHERE {matches(ref)} AND count <= 0;")
+
+    columns = ", ".join(f"{k} TEXT NOT NULL" for k in keys)
+    return [
+        f"""
+        CREATE TABLE IF NOT EXISTS {rollup} (
+            day TEXT NOT NULL, {columns}, count INTEGER NOT NULL,
+            PRIMARY KEY ({pk})
+        ) WITHOUT ROWID
+        """,
+        f"CREATE TRIGGER IF NOT EXISTS {rollup}_insert AFTER INSERT ON {table} BEGIN {add('new')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {rollup}_delete AFTER DELETE ON {table} BEGIN {remove('old')} END",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {rollup}_update AFTER UPDATE OF {', '.join(watched)} ON {table}
+        BEGIN {remove('old')} {add('new')} END
+        """,
+        f"DELETE FROM {rollup}",
+        f"""
+        INSERT INTO {rollup} ({pk}, count)
+        SELECT date({date_col}), {', '.join(f"COALESCE({k}, '')" for k in keys)}, COUNT(*)
+        FROM {table}
+        WHERE date({date_col}) IS NOT NULL
+        GROUP BY 1, {', '.join(str(i + 2) for i in range(len(keys)))}
+        """,
+    ]
+
+
+# Versioned migrations applied in order; PRAGMA user_version records the
+# last one applied. Append new steps, never edit shipped ones.
+SCHEMA_MIGRATIONS = [
+    (1, "indexes for hot filter/sort columns", [
+        # Cybersecurity page: ORDER BY date DESC, KPIs by status/severity
+        "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_date ON cyber_incidents (date)",
+        "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_status_severity ON cyber_incidents (status, severity)",
+        "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_severity_date ON cyber_incidents (severity, date)",
+        # IT Operations: queue by status/priority, staff view by assignee
+        "CREATE INDEX IF NOT EXISTS idx_it_tickets_status_priority ON it_tickets (status, priority)",
+        "CREATE INDEX IF NOT EXISTS idx_it_tickets_assigned_to_status ON it_tickets (assigned_to, status)",
+        "CREATE INDEX IF NOT EXISTS idx_it_tickets_priority_created ON it_tickets (priority, created_date)",
+        "CREATE INDEX IF NOT EXISTS idx_it_tickets_created_date ON it_tickets (created_date)",
+        # Data Science: category filter, storage by source
+        "CREATE INDEX IF NOT EXISTS idx_datasets_metadata_category ON datasets_metadata (category)",
+        "CREATE INDEX IF NOT EXISTS idx_datasets_metadata_source_size ON datasets_metadata (source, file_size_mb)",
+    ]),
+    (2, "indexes for filtered keyset pagination", [
+        # (filter, sort key[, rowid]) so a filtered page seeks instead of sorting
+        "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_status_date ON cyber_incidents (status, date)",
+        "CREATE INDEX IF NOT EXISTS idx_it_tickets_status_created ON it_tickets (status, created_date)",
+        "CREATE INDEX IF NOT EXISTS idx_it_tickets_status ON it_tickets (status)",
+    ]),
+    (3, "CSV source keys and sync state for incremental loads", [
+        # source_key = CSV id (or content hash), source_hash = hash of the CSV
+        # row as last loaded; both stay NULL for rows created in the app.
+        "ALTER TABLE cyber_incidents ADD COLUMN source_key TEXT",
+        "ALTER TABLE cyber_incidents ADD COLUMN source_hash TEXT",
+        "ALTER TABLE it_tickets ADD COLUMN source_key TEXT",
+        "ALTER TABLE it_tickets ADD COLUMN source_hash TEXT",
+        "ALTER TABLE datasets_metadata ADD COLUMN source_key TEXT",
+        "ALTER TABLE datasets_metadata ADD COLUMN source_hash TEXT",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_cyber_incidents_source_key ON cyber_incidents (source_key)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_it_tickets_source_key ON it_tickets (source_key)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_datasets_metadata_source_key ON datasets_metadata (source_key)",
+        """
+        CREATE TABLE IF NOT EXISTS csv_sync_state (
+            table_name TEXT PRIMARY KEY,
+            csv_path TEXT,
+            csv_size INTEGER,
+            csv_mtime REAL,
+            high_water_mark INTEGER,
+            rows_seen INTEGER,
+            synced_at TEXT
+        )
+        """,
+    ]),
+    (4, "login sessions", [
+        # token_hash = sha256 of the session id; the signed token itself is
+        # never stored. Times are Unix epoch seconds.
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            token_hash TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions (username)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)",
+    ]),
+    (5, "persisted login throttle state", [
+        # key = "user:<name>" or "client:<id>"; see services/rate_limiter.py
+        """
+        CREATE TABLE IF NOT EXISTS login_throttle (
+            key TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            locked_until REAL NOT NULL DEFAULT 0
+        )
+        """,
+    ]),
+    (6, "full-text search over tickets", [
+        # external-content index: text lives in it_tickets, triggers keep it in step
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS it_tickets_fts USING fts5(
+            title, assigned_to, status,
+            content='it_tickets', content_rowid='id',
+            tokenize='unicode61', prefix='2 3'
+        )
+        """,
+        # rank = bm25 with title matches weighted above assignee, then status
+        "INSERT INTO it_tickets_fts (it_tickets_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')",
+        """
+        CREATE TRIGGER IF NOT EXISTS it_tickets_fts_insert AFTER INSERT ON it_tickets BEGIN
+            INSERT INTO it_tickets_fts (rowid, title, assigned_to, status)
+            VALUES (new.id, new.title, new.assigned_to, new.status);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS it_tickets_fts_delete AFTER DELETE ON it_tickets BEGIN
+            INSERT INTO it_tickets_fts (it_tickets_fts, rowid, title, assigned_to, status)
+            VALUES ('delete', old.id, old.title, old.assigned_to, old.status);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS it_tickets_fts_update
+        AFTER UPDATE OF title, assigned_to, status ON it_tickets BEGIN
+            INSERT INTO it_tickets_fts (it_tickets_fts, rowid, title, assigned_to, status)
+            VALUES ('delete', old.id, old.title, old.assigned_to, old.status);
+            INSERT INTO it_tickets_fts (rowid, title, assigned_to, status)
+            VALUES (new.id, new.title, new.assigned_to, new.status);
+        END
+        """,
+        "INSERT INTO it_tickets_fts (it_tickets_fts) VALUES ('rebuild')",
+    ]),
+    (7, "incident categories and full-text search over incidents", [
+        # Virtual generated column: evaluated from title, and materialized in
+        # the index, so category counts/filters are index lookups.
+        f"""
+        ALTER TABLE cyber_incidents ADD COLUMN incident_category TEXT
+        GENERATED ALWAYS AS ({category_sql("title")}) VIRTUAL
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_cyber_incidents_category_date ON cyber_incidents (incident_category, date)",
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS cyber_incidents_fts USING fts5(
+            title, incident_category,
+            content='cyber_incidents', content_rowid='id',
+            tokenize='unicode61', prefix='2 3'
+        )
+        """,
+        "INSERT INTO cyber_incidents_fts (cyber_incidents_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0)')",
+        """
+        CREATE TRIGGER IF NOT EXISTS cyber_incidents_fts_insert AFTER INSERT ON cyber_incidents BEGIN
+            INSERT INTO cyber_incidents_fts (rowid, title, incident_category)
+            VALUES (new.id, new.title, new.incident_category);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cyber_incidents_fts_delete AFTER DELETE ON cyber_incidents BEGIN
+            INSERT INTO cyber_incidents_fts (cyber_incidents_fts, rowid, title, incident_category)
+            VALUES ('delete', old.id, old.title, old.incident_category);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cyber_incidents_fts_update AFTER UPDATE OF title ON cyber_incidents BEGIN
+            INSERT INTO cyber_incidents_fts (cyber_incidents_fts, rowid, title, incident_category)
+            VALUES ('delete', old.id, old.title, old.incident_category);
+            INSERT INTO cyber_incidents_fts (rowid, title, incident_category)
+            VALUES (new.id, new.title, new.incident_category);
+        END
+        """,
+        "INSERT INTO cyber_incidents_fts (cyber_incidents_fts) VALUES ('rebuild')",
+    ]),
+    (8, "daily rollups for incident and ticket time series",
+        # incident_category follows title, hence title in the watched columns
+        _rollup_statements("cyber_incidents", "incident_daily_rollup", "date",
+                           ("severity", "status", "incident_category"),
+                           ("date", "severity", "status", "title"))
+        + _rollup_statements("it_tickets", "ticket_daily_rollup", "created_date",
+                             ("priority", "status"),
+                             ("created_date", "priority", "status"))),
+    (9, "drop login sessions (logins live in Streamlit session state)", [
+        "DROP TABLE IF EXISTS sessions",
+    ]),
+    (10, "store incident categories at write time", [
+        _store_incident_category,
+    ]),
+]
+
+
+def get_schema_version(conn: sqlite3.Connection):
+    """Return the last applied migration version (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate_schema(conn: sqlite3.Connection):
+    """
+    Apply pending SCHEMA_MIGRATIONS. Tables must already exist.
+    Returns the list of versions applied.
+    """
+    current = get_schema_version(conn)
+    applied = []
+    for version, description, statements in SCHEMA_MIGRATIONS:
+        if version <= current:
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for statement in statements:
+                # a callable step does work plain SQL cannot (see migration 10)
+                if callable(statement):
+                    statement(cursor)
+                else:
+                    cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        forget_table_columns()
+        applied.append(version)
+        print(f"Applied schema migration {version}: {description}")
+    return applied
 
 
 def create_all_tables(conn: sqlite3.Connection):
-    """Create all tables."""
+    """Create all tables, apply pending migrations and cache their columns."""
     create_users_table(conn)
     create_cyber_incidents_table(conn)
     create_datasets_metadata_table(conn)
     create_it_tickets_table(conn)
+    migrate_schema(conn)
+    for table in ("users", "cyber_incidents", "datasets_metadata", "it_tickets"):
+        table_columns(conn, table)
     print("all tables created successfully!")
\ No newline at end of file
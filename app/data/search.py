@@ -0,0 +1,77 @@
+import re
+import sqlite3
+
+from .schema import public_columns
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text: str):
+    """
+    Turn free text from a search box into an FTS5 MATCH expression: every
+    word becomes a quoted prefix term ("net"* matches "network") and all
+    must match. Returns None when there is nothing to search for.
+    """
+    terms = _TOKEN.findall(text or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def fts_page(conn: sqlite3.Connection, table: str, fts_table: str, text: str, *,
+             after=None, page_size: int = 50, filters=None, computed=None):
+    """
+    Ranked full-text search over an external-content FTS5 index of table,
+    paged with a (rank, id) keyset cursor like fetch_page.
+
+    filters maps column -> value (or list of values) on table; None is ignored.
+    Returns a dict: rows, columns, next_cursor (None on the last page), has_more.
+    Rows are table's user-facing columns (public_columns) plus computed
+    ({name: SQL expression}; qualify ambiguous columns with t.) in bm25
+    order (best first).
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    match = fts_query(text)
+    if match is None:
+        return {"rows": [], "columns": [], "next_cursor": None, "has_more": False}
+
+    where, params = [f"{fts_table} MATCH ?"], [match]
+    for column, value in (filters or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if not values:
+                continue
+            where.append(f"t.{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+        else:
+            where.append(f"t.{column} = ?")
+            params.append(value)
+    if after is not None:
+        where.append("(f.rank, t.id) > (?, ?)")
+        params.extend(after)
+
+    select = [f"t.{column}" for column in public_columns(conn, table)]
+    select += [f"{expr} AS {name}" for name, expr in (computed or {}).items()]
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT {', '.join(select)}, f.rank AS _rank
+        FROM {fts_table} AS f
+        JOIN {table} AS t ON t.id = f.rowid
+        WHERE {' AND '.join(where)}
+        ORDER BY f.rank, t.id
+        LIMIT ?
+        """,
+        params + [page_size + 1]
+    )
+    rows = cursor.fetchall()
+    columns = [d[0] for d in cursor.description]
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = (rows[-1][-1], rows[-1][columns.index("id")]) if has_more else None
+    return {"rows": [row[:-1] for row in rows], "columns": columns[:-1],
+            "next_cursor": next_cursor, "has_more": has_more}
@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # snapshots are optional; reads fall back to SQLite
+    pa = None
+
+from .cache import table_version
+from .db import get_connection
+from .schema import declared_kind
+
+SNAPSHOT_DIR = Path("DATA") / "snapshots"
+
+# table -> text date columns stored as timestamp[s] (NULL/unparseable -> null)
+SNAPSHOT_TABLES = {
+    "cyber_incidents": ("date", "resolved_date", "created_at"),
+    "it_tickets": ("created_date", "resolved_date"),
+    "datasets_metadata": ("last_updated",),
+}
+
+# Rows per Arrow record batch while writing.
+BATCH_ROWS = 50000
+
+# Seconds a snapshot is trusted without a version change in this process,
+# bounding staleness from writes made by other processes (same as the pages' cache TTL).
+SNAPSHOT_TTL = 300.0
+
+_written = {}          # table -> (table_version, written_at monotonic)
+_lock = threading.Lock()
+_warned_fallback = False
+
+
+def _columns(conn: sqlite3.Connection, table: str):
+    """(name, kind) per column of table, kind in date/integer/real/text."""
+    cursor = conn.cursor()
+    cursor.execute(f"PRAGMA table_xinfo({table})")
+    columns = []
+    for _, name, decl, _, _, _, hidden in cursor.fetchall():
+        if hidden == 1:
+            continue
+        columns.append((name, "date" if name in SNAPSHOT_TABLES[table] else declared_kind(decl)))
+    if not columns:
+        raise sqlite3.OperationalError(f"no such table: {table}")
+    return columns
+
+
+def _typed_select(conn: sqlite3.Connection, table: str, columns=None):
+    """
+    SELECT over table (in id order) that returns every column already
+    typed by SQLite: dates as epoch seconds, numbers as numbers and any
+    non-numeric value in a numeric column as NULL, like
+    pd.to_numeric(errors="coerce") would leave it. Returns (sql, kinds).
+    """
+    if table not in SNAPSHOT_TABLES:
+        raise ValueError(f"no snapshot for {table!r}; choose from {tuple(SNAPSHOT_TABLES)}")
+    kinds = _columns(conn, table)
+    if columns is not None:
+        known = dict(kinds)
+        missing = [c for c in columns if c not in known]
+        if missing:
+            raise ValueError(f"{table} has no column(s) {missing}")
+        kinds = [(c, known[c]) for c in columns]
+    exprs = []
+    for name, kind in kinds:
+        if kind == "date":
+            exprs.append(f"CAST(strftime('%s', {name}) AS INTEGER) AS {name}")
+        elif kind in ("integer", "real"):
+            # a bare CAST would turn 'abc' into 0 and '12abc' into 12
+            exprs.append(f"CASE WHEN typeof({name}) IN ('integer', 'real') "
+                         f"THEN CAST({name} AS {kind.upper()}) END AS {name}")
+        else:
+            exprs.append(f"CAST({name} AS TEXT) AS {name}")
+    return f"SELECT {', '.join(exprs)} FROM {table} ORDER BY id", kinds
+
+
+def snapshot_path(table: str):
+    return SNAPSHOT_DIR / f"{table}.arrow"
+
+
+def write_snapshot(conn: sqlite3.Connection, table: str, path=None):
+    """
+    Write table to an uncompressed Arrow IPC file, BATCH_ROWS rows per
+    record batch, then atomically replace the previous snapshot.
+    Returns the path.
+    """
+    if pa is None:
+        raise RuntimeError("snapshots need pyarrow (pip install pyarrow)")
+    path = Path(path) if path is not None else snapshot_path(table)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrow_types = {"date": pa.timestamp("s"), "integer": pa.int64(),
+                   "real": pa.float64(), "text": pa.string()}
+
+    sql, kinds = _typed_select(conn, table)
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in kinds])
+    cursor = conn.cursor()
+    cursor.execute(sql)
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            while True:
+                rows = cursor.fetchmany(BATCH_ROWS)
+                if not rows:
+                    break
+                values = list(zip(*rows))
+                writer.write_batch(pa.record_batch(
+                    [pa.array(v, type=f.type) for v, f in zip(values, schema)], schema=schema
+                ))
+        os.replace(tmp, path)
+    except Exception:
+        if tmp.exists():
+            tmp.unlink()
+        raise
+    return path
+
+
+def ensure_snapshot(table: str):
+    """
+    Path of an up-to-date snapshot of table, rewriting it first if the
+    table's version changed since this process last wrote it (or it is
+    older than SNAPSHOT_TTL). None when pyarrow is not installed.
+    """
+    if pa is None:
+        return None
+    path = snapshot_path(table)
+    with _lock:
+        version = table_version(table)
+        written = _written.get(table)
+        fresh = (written is not None and written[0] == version
+                 and time.monotonic() - written[1] < SNAPSHOT_TTL and path.exists())
+        if not fresh:
+            with get_connection() as conn:
+                write_snapshot(conn, table, path)
+            _written[table] = (version, time.monotonic())
+    return path
+
+
+def read_snapshot(table: str, columns=None):
+    """
+    The table's snapshot as a pyarrow.Table, memory-mapped (no copy of the
+    file) and projected to columns. None when pyarrow is not installed.
+    """
+    path = ensure_snapshot(table)
+    if path is None:
+        return None
+    # Buffers keep the mapping alive for as long as the Table is referenced.
+    data = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return data.select(list(columns)) if columns is not None else data
+
+
+def snapshot_frame(table: str, columns=None):
+    """
+    Typed DataFrame of table (id order) for analytics: dates are
+    datetime64, numeric columns numeric. Read from the Arrow snapshot,
+    or straight from SQLite with the same typing when pyarrow is missing.
+    CRUD paths keep using SQLite directly.
+    """
+    global _warned_fallback
+    data = read_snapshot(table, columns)
+    if data is not None:
+        return data.to_pandas()
+    if not _warned_fallback:
+        _warned_fallback = True
+        print("pyarrow is not installed; analytics read from SQLite (pip install pyarrow)")
+
+    with get_connection() as conn:
+        sql, kinds = _typed_select(conn, table, columns)
+        df = pd.read_sql_query(sql, conn)
+    for name, kind in kinds:
+        if kind == "date":
+            df[name] = pd.to_datetime(df[name], unit="s")
+    return df
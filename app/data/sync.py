@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .cache import bump_table_version
+from .ingest import INGEST_SPECS, CHUNK_SIZE, stream_csv, row_hash, source_key
+from .schema import create_all_tables
+
+# Per table: positions (in the INGEST_SPECS insert columns) that identify a
+# legacy row loaded before source keys existed, and the columns a changed
+# CSV row may overwrite. Columns edited in the app (resolved_date, and
+# assigned_to unless the CSV supplies one) are never clobbered.
+SYNC_SPECS = {
+    "cyber_incidents": {
+        "identity": (0, 1, 3),                      # title, severity, date
+        "update": ("title", "severity", "status", "date"),
+    },
+    "it_tickets": {
+        "identity": (0, 1, 3),                      # title, priority, created_date
+        "update": ("title", "priority", "status", "created_date", "assigned_to"),
+        "keep_if_null": ("assigned_to",),
+    },
+    "datasets_metadata": {
+        "identity": (0, 1, 2, 5),                   # name, category, source, size
+        "update": ("dataset_name", "category", "source", "file_size_mb"),
+    },
+}
+
+# Max host parameters per IN (...) lookup.
+_LOOKUP_CHUNK = 500
+
+
+def get_sync_state(conn: sqlite3.Connection, table: str):
+    """Last sync record for table as a dict, or None."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM csv_sync_state WHERE table_name = ?", (table,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([d[0] for d in cursor.description], row))
+
+
+def _upsert_sql(table: str, columns, spec):
+    keep = spec.get("keep_if_null", ())
+    sets = [
+        f"{c} = COALESCE(excluded.{c}, {c})" if c in keep else f"{c} = excluded.{c}"
+        for c in spec["update"]
+    ]
+    sets.append("source_hash = excluded.source_hash")
+    all_cols = columns + ("source_key", "source_hash")
+    return f"""
+        INSERT INTO {table} ({', '.join(all_cols)})
+        VALUES ({', '.join('?' * len(all_cols))})
+        ON CONFLICT (source_key) DO UPDATE SET {', '.join(sets)}
+        WHERE source_hash IS NOT excluded.source_hash
+    """
+
+
+def _adopt_sql(table: str, columns, spec):
+    """
+    UPDATE that claims a legacy row for a CSV key and applies the CSV's
+    values to the updatable columns, so its stored hash matches its content.
+    Returns (sql, positions of those columns in an INGEST_SPECS row).
+    """
+    keep = spec.get("keep_if_null", ())
+    sets = [f"{c} = COALESCE(?, {c})" if c in keep else f"{c} = ?" for c in spec["update"]]
+    sets += ["source_key = ?", "source_hash = ?"]
+    positions = [columns.index(c) for c in spec["update"]]
+    return f"UPDATE {table} SET {', '.join(sets)} WHERE id = ?", positions
+
+
+def _existing_hashes(cursor, table: str, keys):
+    found = {}
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = keys[start:start + _LOOKUP_CHUNK]
+        cursor.execute(
+            f"SELECT source_key, source_hash FROM {table} WHERE source_key IN ({','.join('?' * len(chunk))})",
+            chunk
+        )
+        found.update(cursor.fetchall())
+    return found
+
+
+def _legacy_rows(cursor, table: str, columns, identity):
+    """identity hash -> [ids] for rows loaded before source keys existed."""
+    cols = [columns[i] for i in identity]
+    cursor.execute(f"SELECT id, {', '.join(cols)} FROM {table} WHERE source_key IS NULL")
+    legacy = {}
+    for row in cursor.fetchall():
+        legacy.setdefault(row_hash(row[1:]), []).append(row[0])
+    return legacy
+
+
+def sync_csv(conn: sqlite3.Connection, table: str, csv_path, delete_missing: bool = True,
+             append_only: bool = False, force: bool = False, chunk_size: int = CHUNK_SIZE):
+    """
+    Incrementally apply a CSV export to table.
+
+    Each CSV row is keyed by its id column (or a content hash). Per chunk,
+    stored hashes are looked up and only new or changed rows are written,
+    with INSERT ... ON CONFLICT (source_key) DO UPDATE. Rows whose key no
+    longer appears in the CSV are deleted when delete_missing is set; rows
+    created in the app (source_key NULL) are never deleted.
+
+    append_only skips every row at or below the recorded high-water mark
+    (max numeric CSV id) and never deletes. Unless force is set, a CSV whose
+    size and mtime match the last sync is skipped without being read.
+
+    Rows loaded before source keys existed are adopted by matching their
+    identity columns, so the first sync does not duplicate them; adoption
+    applies the CSV's values to the updatable columns like an update.
+
+    Returns a dict of counts: inserted, updated, unchanged, adopted,
+    deleted, skipped, rows, plus seconds.
+    """
+    start = time.perf_counter()
+    create_all_tables(conn)
+    required, columns, to_row = INGEST_SPECS[table]
+    spec = SYNC_SPECS[table]
+    csv_path = Path(csv_path)
+    stat = os.stat(csv_path)
+
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "adopted": 0,
+             "deleted": 0, "skipped": 0, "rows": 0, "seconds": 0.0}
+
+    state = get_sync_state(conn, table)
+    if (not force and state and state["csv_path"] == str(csv_path)
+            and state["csv_size"] == stat.st_size and state["csv_mtime"] == stat.st_mtime):
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+    hwm = state["high_water_mark"] if state and append_only else None
+
+    upsert = _upsert_sql(table, columns, spec)
+    adopt_sql, adopt_positions = _adopt_sql(table, columns, spec)
+    if conn.in_transaction:
+        conn.commit()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    try:
+        legacy = _legacy_rows(cursor, table, columns, spec["identity"])
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS sync_seen (source_key TEXT PRIMARY KEY)")
+        cursor.execute("DELETE FROM temp.sync_seen")
+        max_id = hwm
+
+        for chunk in stream_csv(csv_path, chunk_size, required):
+            batch = []
+            for rec in chunk:
+                row = to_row(rec)
+                key = source_key(rec, row)
+                if key.isdigit():
+                    numeric = int(key)
+                    if hwm is not None and numeric <= hwm:
+                        stats["skipped"] += 1
+                        continue
+                    max_id = numeric if max_id is None else max(max_id, numeric)
+                batch.append((key, row_hash(row), row))
+            stats["rows"] += len(chunk)
+
+            cursor.executemany(
+                "INSERT OR IGNORE INTO temp.sync_seen (source_key) VALUES (?)",
+                [(key,) for key, _, _ in batch]
+            )
+            stored = _existing_hashes(cursor, table, [key for key, _, _ in batch])
+
+            writes, adopt = [], []
+            for key, digest, row in batch:
+                if key in stored:
+                    if stored[key] == digest:
+                        stats["unchanged"] += 1
+                        continue
+                    stats["updated"] += 1
+                else:
+                    ids = legacy.get(row_hash(tuple(row[i] for i in spec["identity"])))
+                    if ids:
+                        values = tuple(row[i] for i in adopt_positions)
+                        adopt.append(values + (key, digest, ids.pop()))
+                        stored[key] = digest
+                        continue
+                    stats["inserted"] += 1
+                stored[key] = digest
+                writes.append(row + (key, digest))
+
+            if adopt:
+                cursor.executemany(adopt_sql, adopt)
+                stats["adopted"] += len(adopt)
+            if writes:
+                cursor.executemany(upsert, writes)
+
+        if delete_missing and not append_only:
+            cursor.execute(f"""
+                DELETE FROM {table}
+                WHERE source_key IS NOT NULL
+                  AND source_key NOT IN (SELECT source_key FROM temp.sync_seen)
+            """)
+            stats["deleted"] = cursor.rowcount
+
+        cursor.execute("""
+            INSERT INTO csv_sync_state
+                (table_name, csv_path, csv_size, csv_mtime, high_water_mark, rows_seen, synced_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (table_name) DO UPDATE SET
+                csv_path = excluded.csv_path,
+                csv_size = excluded.csv_size,
+                csv_mtime = excluded.csv_mtime,
+                high_water_mark = excluded.high_water_mark,
+                rows_seen = excluded.rows_seen,
+                synced_at = excluded.synced_at
+        """, (table, str(csv_path), stat.st_size, stat.st_mtime, max_id, stats["rows"],
+              datetime.utcnow().isoformat(timespec="seconds")))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if stats["inserted"] or stats["updated"] or stats["deleted"] or stats["adopted"]:
+        bump_table_version(table)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
@@ -2,11 +2,24 @@ import pandas as pd
 from pathlib import Path
 import sqlite3
 
-from .db import connect_database
-from .schema import create_it_tickets_table
+from .db import get_connection
+from .cache import bump_table_version
+from .schema import create_it_tickets_table, table_columns
+from .batch import normalize_rows, existing_ids, run_batch, align_ids
+from .paging import fetch_page
+from .updates import update_row
+from .search import fts_page
+from .ingest import ingest_csv
+from .sync import sync_csv
+from models import ITTicket, model_row_factory
 
 DATA_DIR = Path("DATA")
 
+ticket_row = model_row_factory(ITTicket)
+
+# Days since created_date (local time, one decimal), as the queue shows it.
+TICKET_AGE_SQL = "ROUND(julianday('now', 'localtime') - julianday(created_date), 1)"
+
 
 def insert_ticket(conn: sqlite3.Connection, title: str, priority: str,
                   status: str = "open", created_date: str = None, assigned_to: str = None):
@@ -16,9 +29,7 @@ def insert_ticket(conn: sqlite3.Connection, title: str, priority: str,
     it_tickets(id, title, priority, status, created_date, resolved_date?, assigned_to?)
     """
     cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(it_tickets)")
-    cols = [row[1] for row in cursor.fetchall()]
-    if "assigned_to" in cols:
+    if "assigned_to" in table_columns(conn, "it_tickets"):
         cursor.execute(
             """
             INSERT INTO it_tickets (title, priority, status, created_date, assigned_to)
@@ -35,83 +46,88 @@ def insert_ticket(conn: sqlite3.Connection, title: str, priority: str,
             (title, priority, status, created_date)
         )
     conn.commit()
+    bump_table_version("it_tickets")
     return cursor.lastrowid
 
 
 def get_ticket_by_id(conn: sqlite3.Connection, ticket_id: int):
-    """Fetch one ticket by id."""
+    """Fetch one ticket by id as an ITTicket (None if missing)."""
     cursor = conn.cursor()
+    cursor.row_factory = ticket_row
     cursor.execute("SELECT * FROM it_tickets WHERE id = ?", (ticket_id,))
     return cursor.fetchone()
 
 
 def get_all_tickets(conn: sqlite3.Connection):
-    """Fetch all tickets."""
+    """Fetch all tickets as ITTicket objects, newest first."""
     cursor = conn.cursor()
+    cursor.row_factory = ticket_row
     cursor.execute("SELECT * FROM it_tickets ORDER BY id DESC")
     return cursor.fetchall()
 
 
-def update_ticket(conn: sqlite3.Connection, ticket_id: int,
-                  title=None, priority=None, status=None, created_date=None, assigned_to=None):
+def get_tickets_page(conn: sqlite3.Connection, after=None, page_size: int = 50,
+                     sort: str = "id", descending: bool = True,
+                     status=None, priority=None, assigned_to=None):
     """
-    Update ticket fields if provided.
-    If status transitions to 'closed', set `resolved_date` to now.
+    Fetch one page of tickets using keyset pagination.
+    sort: "id" or "created_date". Filters take a value or list of values.
+    Rows end with age_days (TICKET_AGE_SQL).
+    Pass the returned next_cursor as `after` to get the following page.
     """
-    current = get_ticket_by_id(conn, ticket_id)
-    if not current:
-        return False
+    return fetch_page(
+        conn, "it_tickets",
+        sort=sort, descending=descending, after=after, page_size=page_size,
+        filters={"status": status, "priority": priority, "assigned_to": assigned_to},
+        sortable=("id", "created_date"),
+        filterable=("status", "priority", "assigned_to"),
+        computed={"age_days": TICKET_AGE_SQL}
+    )
 
-    current_status = current[3]
-    current_resolved = None
-    current_assigned = None
-    if len(current) >= 6:
-        current_resolved = current[5]
-    if len(current) >= 7:
-        current_assigned = current[6]
 
-    new_title = title if title is not None else current[1]
-    new_priority = priority if priority is not None else current[2]
-    new_status = status if status is not None else current_status
-    new_created_date = created_date if created_date is not None else current[4]
-    new_assigned = assigned_to if assigned_to is not None else current_assigned
+def search_tickets(conn: sqlite3.Connection, text: str, after=None, page_size: int = 50,
+                   status=None, priority=None):
+    """
+    Full-text search over ticket title, assignee and status (FTS5 index
+    from schema migration 6). Words match as prefixes and results come back
+    best match first. A purely numeric search is treated as a ticket id
+    (still subject to the status/priority filters).
+    Returns a page dict like get_tickets_page.
+    """
+    text = (text or "").strip()
+    filters = {"status": status, "priority": priority}
+    if text.isdigit():
+        return fetch_page(
+            conn, "it_tickets", page_size=page_size,
+            filters={"id": int(text), **filters},
+            filterable=("id", "status", "priority"),
+            computed={"age_days": TICKET_AGE_SQL}
+        )
+    return fts_page(
+        conn, "it_tickets", "it_tickets_fts", text,
+        after=after, page_size=page_size, filters=filters,
+        computed={"age_days": TICKET_AGE_SQL}
+    )
 
-    new_resolved_date = current_resolved
-    if new_status and new_status.lower() == "closed" and (current_status is None or current_status.lower() != "closed"):
-        new_resolved_date = pd.Timestamp.now().isoformat()
 
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(it_tickets)")
-    cols = [row[1] for row in cursor.fetchall()]
-    if "resolved_date" in cols and "assigned_to" in cols:
-        cursor.execute(
-            """
-            UPDATE it_tickets
-            SET title = ?, priority = ?, status = ?, created_date = ?, resolved_date = ?, assigned_to = ?
-            WHERE id = ?
-            """,
-            (new_title, new_priority, new_status, new_created_date, new_resolved_date, new_assigned, ticket_id)
-        )
-    elif "resolved_date" in cols:
-        cursor.execute(
-            """
-            UPDATE it_tickets
-            SET title = ?, priority = ?, status = ?, created_date = ?, resolved_date = ?
-            WHERE id = ?
-            """,
-            (new_title, new_priority, new_status, new_created_date, new_resolved_date, ticket_id)
-        )
-    else:
-        cursor.execute(
-            """
-            UPDATE it_tickets
-            SET title = ?, priority = ?, status = ?, created_date = ?
-            WHERE id = ?
-            """,
-            (new_title, new_priority, new_status, new_created_date, ticket_id)
-        )
+def update_ticket(conn: sqlite3.Connection, ticket_id: int,
+                  title=None, priority=None, status=None, created_date=None, assigned_to=None):
+    """
+    Update only the supplied ticket fields, in one UPDATE with no prior
+    read or schema check. If status transitions to 'closed' (any case),
+    resolved_date is set to now in the same statement.
+    Returns False if the ticket does not exist.
+    """
+    found = update_row(
+        conn, "it_tickets", ticket_id,
+        {"title": title, "priority": priority, "status": status,
+         "created_date": created_date, "assigned_to": assigned_to},
+        closed_status="closed", resolved_value=pd.Timestamp.now().isoformat(), ignore_case=True
+    )
     conn.commit()
-    return True
+    if found:
+        bump_table_version("it_tickets")
+    return found
 
 
 def delete_ticket(conn: sqlite3.Connection, ticket_id: int):
@@ -119,15 +135,102 @@ def delete_ticket(conn: sqlite3.Connection, ticket_id: int):
     cursor = conn.cursor()
     cursor.execute("DELETE FROM it_tickets WHERE id = ?", (ticket_id,))
     conn.commit()
+    bump_table_version("it_tickets")
     return cursor.rowcount
 
 
-def load_it_tickets_csv(conn: sqlite3.Connection, csv_filename="it_tickets_1000.csv", force: bool = False):
+TICKET_FIELDS = ("title", "priority", "status", "created_date", "assigned_to")
+
+
+def insert_tickets_many(conn: sqlite3.Connection, rows):
+    """
+    Insert many tickets in one transaction.
+    rows: dicts with TICKET_FIELDS keys, or tuples in that order.
+    Returns (ids, errors): ids lines up with rows (None for failed rows),
+    errors is a list of (row_index, message).
+    """
+    params, errors = normalize_rows(rows, TICKET_FIELDS, required=("title", "priority", "created_date"))
+    params = [
+        (i, (t, pr, st if st is not None else "open", cd, a))
+        for i, (t, pr, st, cd, a) in params
+    ]
+    if "assigned_to" in table_columns(conn, "it_tickets"):
+        sql = """
+            INSERT INTO it_tickets (title, priority, status, created_date, assigned_to)
+            VALUES (?, ?, ?, ?, ?)
+        """
+    else:
+        sql = "INSERT INTO it_tickets (title, priority, status, created_date) VALUES (?, ?, ?, ?)"
+        params = [(i, p[:4]) for i, p in params]
+    ids, run_errors = run_batch(conn, sql, params, returning_ids=True)
+    bump_table_version("it_tickets")
+    return align_ids(len(rows), params, ids), sorted(errors + run_errors)
+
+
+def update_tickets_many(conn: sqlite3.Connection, updates):
+    """
+    Apply many ticket updates in one transaction.
+    updates: dicts with "id" plus any of TICKET_FIELDS; missing/None fields
+    keep their current value. resolved_date is stamped on a transition to
+    'closed', as in update_ticket.
+    Returns (updated_count, errors).
+    """
+    params, errors = normalize_rows(updates, ("id",) + TICKET_FIELDS, required=("id",))
+    found = existing_ids(conn, "it_tickets", [p[0] for _, p in params])
+    errors += [(i, f"ticket {p[0]} not found") for i, p in params if p[0] not in found]
+
+    now = pd.Timestamp.now().isoformat()
+    params = [
+        (i, (title, priority, status, created_date, assigned_to, status, now, ticket_id))
+        for i, (ticket_id, title, priority, status, created_date, assigned_to) in params
+        if ticket_id in found
+    ]
+    if "assigned_to" in table_columns(conn, "it_tickets"):
+        assign_sql = "assigned_to = COALESCE(?, assigned_to),"
+    else:
+        assign_sql = ""
+        params = [(i, p[:4] + p[5:]) for i, p in params]
+    updated, run_errors = run_batch(conn, f"""
+        UPDATE it_tickets
+        SET title = COALESCE(?, title),
+            priority = COALESCE(?, priority),
+            status = COALESCE(?, status),
+            created_date = COALESCE(?, created_date),
+            {assign_sql}
+            resolved_date = CASE
+                WHEN LOWER(?) = 'closed' AND LOWER(COALESCE(status, '')) != 'closed' THEN ?
+                ELSE resolved_date
+            END
+        WHERE id = ?
+    """, params)
+    bump_table_version("it_tickets")
+    return updated, sorted(errors + run_errors)
+
+
+def delete_tickets_many(conn: sqlite3.Connection, ticket_ids):
+    """
+    Delete many tickets in one transaction.
+    Returns (deleted_count, errors); unknown ids are reported as errors.
+    """
+    params, errors = normalize_rows([(x,) for x in ticket_ids], ("id",), required=("id",))
+    found = existing_ids(conn, "it_tickets", [p[0] for _, p in params])
+    errors += [(i, f"ticket {p[0]} not found") for i, p in params if p[0] not in found]
+    params = [(i, p) for i, p in params if p[0] in found]
+    deleted, run_errors = run_batch(conn, "DELETE FROM it_tickets WHERE id = ?", params)
+    bump_table_version("it_tickets")
+    return deleted, sorted(errors + run_errors)
+
+
+def load_it_tickets_csv(conn: sqlite3.Connection, csv_filename="it_tickets_1000.csv", force: bool = False,
+                        incremental: bool = False):
     """
     Load IT tickets from CSV into it_tickets table.
-    CSV columns expected: id, title, priority, status, created_date
+    CSV columns expected: id, title, priority, status, created_date[, assigned_to]
 
-    If your CSV has 'id', we drop it so SQLite autoincrements.
+    The CSV 'id' is not copied so SQLite autoincrements.
+    The file is streamed in chunks (see app/data/ingest.py).
+    incremental=True applies only inserts/updates/deletes since the last
+    load, keyed on the CSV id (see app/data/sync.py).
     """
     create_it_tickets_table(conn)
 
@@ -137,15 +240,11 @@ def load_it_tickets_csv(conn: sqlite3.Connection, csv_filename="it_tickets_1000.
         print(f"CSV not found: {csv_path}")
         return 0
 
-    df = pd.read_csv(csv_path)
-    df.columns = df.columns.str.strip()
-
-    expected_cols = ["id", "title", "priority", "status", "created_date"]
-    if "assigned_to" in df.columns:
-        expected_cols.append("assigned_to")
-    df = df[expected_cols]
-
-    df = df.drop(columns=["id"])
+    if incremental:
+        stats = sync_csv(conn, "it_tickets", csv_path)
+        print(f"Synced it_tickets from CSV: {stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['deleted']} deleted, {stats['unchanged']} unchanged, {stats['adopted']} adopted")
+        return stats["inserted"] + stats["updated"]
 
     cursor = conn.cursor()
     cursor.execute("SELECT COUNT(1) FROM it_tickets")
@@ -154,19 +253,15 @@ def load_it_tickets_csv(conn: sqlite3.Connection, csv_filename="it_tickets_1000.
         if not force:
             print(f"it_tickets already has {existing} rows; skipping CSV load (use force=True to overwrite)")
             return 0
-        else:
-            cursor.execute("DELETE FROM it_tickets")
-            conn.commit()
-            print("Existing it_tickets rows deleted (force=True).")
+        print("Replacing existing it_tickets rows (force=True).")
 
-    df.to_sql("it_tickets", conn, if_exists="append", index=False)
+    stats = ingest_csv(conn, "it_tickets", csv_path, replace=existing > 0)
 
-    print(f"Loaded {len(df)} rows into it_tickets")
-    return len(df)
+    print(f"Loaded {stats['rows']} rows into it_tickets ({stats['rows_per_sec']:,.0f} rows/s)")
+    return stats["rows"]
 
 
 if __name__ == "__main__":
-    c = connect_database()
-    load_it_tickets_csv(c)
-    print(get_all_tickets(c)[:3])
-    c.close()
\ No newline at end of file
+    with get_connection() as c:
+        load_it_tickets_csv(c)
+        print(get_all_tickets(c)[:3])
\ No newline at end of file
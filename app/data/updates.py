@@ -0,0 +1,50 @@
+import sqlite3
+
+from .schema import table_columns, forget_table_columns
+
+
+def update_row(conn: sqlite3.Connection, table: str, row_id: int, fields, *,
+               closed_status=None, resolved_value=None, ignore_case=False):
+    """
+    Partial update of one row in a single statement: only fields with a
+    non-None value are SET. No read of the current row. Raises ValueError
+    for a field the table has no column for (after re-reading the schema
+    once, in case it changed since it was cached).
+
+    If fields sets status to closed_status, resolved_date becomes
+    resolved_value in the same UPDATE, but only when the row's current
+    status is not already closed; the comparison with the old value is a
+    CASE WHEN in SQL (ignore_case compares with LOWER()).
+
+    Returns True if the row exists. The caller commits.
+    """
+    updates = {k: v for k, v in fields.items() if v is not None}
+    columns = table_columns(conn, table)
+    if not columns.issuperset(updates):
+        forget_table_columns(table)
+        columns = table_columns(conn, table)
+        missing = sorted(set(updates) - columns)
+        if missing:
+            raise ValueError(f"{table} has no column(s) {missing}")
+    cursor = conn.cursor()
+    if not updates:
+        cursor.execute(f"SELECT 1 FROM {table} WHERE id = ?", (row_id,))
+        return cursor.fetchone() is not None
+
+    sets = [f"{column} = ?" for column in updates]
+    params = list(updates.values())
+
+    status = updates.get("status")
+    closing = (
+        closed_status is not None and status is not None and "resolved_date" in columns
+        and (status.lower() == closed_status.lower() if ignore_case else status == closed_status)
+    )
+    if closing:
+        old_status = "LOWER(COALESCE(status, ''))" if ignore_case else "COALESCE(status, '')"
+        sets.append(
+            f"resolved_date = CASE WHEN {old_status} != ? THEN ? ELSE resolved_date END"
+        )
+        params += [closed_status.lower() if ignore_case else closed_status, resolved_value]
+
+    cursor.execute(f"UPDATE {table} SET {', '.join(sets)} WHERE id = ?", params + [row_id])
+    return cursor.rowcount > 0
@@ -1,24 +1,77 @@
-from app.data.db import connect_database
+from app.data.db import get_connection
+from app.data.cache import bump_table_version, QueryCache
+from models import User, model_row_factory
+
+# Seconds a cached user row stays valid; writes through this module also
+# drop the entry immediately.
+PROFILE_TTL = 300
+
+# username -> User. Misses are not cached, so a user created elsewhere
+# is found on the next lookup.
+profile_cache = QueryCache(maxsize=1024)
+
+user_row = model_row_factory(User)
+
+
+def invalidate_user(username):
+    """Forget the cached row for username (call after changing it)."""
+    profile_cache.discard(username)
+
 
 def get_user_by_username(username):
-    """Retrieve user by username."""
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM users WHERE username = ?",
-        (username,)
-    )
-    user = cursor.fetchone()
-    conn.close()
-    return user
+    """Retrieve user by username as a User (None if unknown)."""
+    found, row = profile_cache.get(username)
+    if found:
+        return row
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = user_row
+        cursor.execute(
+            "SELECT id, username, password_hash, role FROM users WHERE username = ?",
+            (username,)
+        )
+        row = cursor.fetchone()
+    if row is not None:
+        profile_cache.put(username, row, PROFILE_TTL)
+    return row
+
 
 def insert_user(username, password_hash, role='user'):
     """Insert new user."""
-    conn = connect_database()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-        (username, password_hash, role)
-    )
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+            (username, password_hash, role)
+        )
+        conn.commit()
+    invalidate_user(username)
+    bump_table_version("users")
+
+
+def update_password_hash(username, password_hash):
+    """Replace a user's stored hash (used when re-hashing at a new cost)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE users SET password_hash = ? WHERE username = ?",
+            (password_hash, username)
+        )
+        conn.commit()
+    invalidate_user(username)
+    bump_table_version("users")
+
+
+def update_user_role(username, role):
+    """Change a user's role. Returns True if the user exists."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE users SET role = ? WHERE username = ?",
+            (role, username)
+        )
+        conn.commit()
+        updated = cursor.rowcount > 0
+    invalidate_user(username)
+    bump_table_version("users")
+    return updated
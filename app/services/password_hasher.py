@@ -0,0 +1,235 @@
+import asyncio
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+# Worker processes for bcrypt; each call is ~250ms of CPU at cost 12.
+HASH_WORKERS = os.cpu_count() or 1
+
+# Hash/verify jobs allowed in flight (queued + running) before new ones
+# are rejected. Beyond this a login would wait seconds anyway.
+MAX_PENDING = HASH_WORKERS * 4
+
+# Seconds a blocking call waits for its result.
+HASH_TIMEOUT = 30.0
+
+# Verify latency calibrate_rounds() aims for on this machine. Override the
+# result with BCRYPT_ROUNDS to pin a cost per deployment. Calibration never
+# goes below bcrypt's default cost, so a slow measurement cannot weaken hashes.
+TARGET_VERIFY_MS = 250.0
+MIN_ROUNDS = 12
+MAX_ROUNDS = 16
+
+# The calibrated cost is measured once and kept here, so every process and
+# restart hashes at the same cost.
+ROUNDS_FILE = Path("DATA") / "bcrypt_rounds"
+
+_COST_RE = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+_target_rounds = None
+
+
+class HasherBusy(Exception):
+    """
+    Raised instead of queueing when MAX_PENDING jobs are already in flight,
+    and by the blocking calls when a job does not finish within its timeout.
+    """
+
+
+def _hashpw(password: bytes, rounds: int):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _checkpw(password: bytes, hashed: bytes):
+    return bcrypt.checkpw(password, hashed)
+
+
+def hash_rounds(hashed: str):
+    """Cost factor of a bcrypt hash ('$2b$12$...' -> 12), or None if not bcrypt."""
+    match = _COST_RE.match(hashed or "")
+    return int(match.group(1)) if match else None
+
+
+def calibrate_rounds(target_ms: float = TARGET_VERIFY_MS, min_rounds: int = MIN_ROUNDS,
+                     max_rounds: int = MAX_ROUNDS, probe_rounds: int = 8, samples: int = 3):
+    """
+    Highest cost whose verify time stays within target_ms on this machine.
+
+    Times a few cheap hashes at probe_rounds and extrapolates, since each
+    extra round doubles the work. Clamped to [min_rounds, max_rounds].
+    """
+    password = b"calibration"
+    best = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(probe_rounds))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rounds = probe_rounds
+    while rounds < max_rounds and best * 2 ** (rounds + 1 - probe_rounds) * 1000 <= target_ms:
+        rounds += 1
+    return max(min_rounds, min(rounds, max_rounds))
+
+
+def rounds_pinned():
+    """True when BCRYPT_ROUNDS fixes the cost for this deployment."""
+    return bool(os.environ.get("BCRYPT_ROUNDS"))
+
+
+def _stored_rounds():
+    """Cost saved in ROUNDS_FILE, calibrating and saving it on first use."""
+    def read():
+        return max(MIN_ROUNDS, min(int(ROUNDS_FILE.read_text().strip()), MAX_ROUNDS))
+
+    try:
+        return read()
+    except (FileNotFoundError, ValueError):
+        pass
+    rounds = calibrate_rounds()
+    ROUNDS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(ROUNDS_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        # another process calibrated first; use theirs unless it is unreadable
+        try:
+            return read()
+        except ValueError:
+            return rounds
+    with os.fdopen(fd, "w") as f:
+        f.write(f"{rounds}\n")
+    return rounds
+
+
+def target_rounds():
+    """BCRYPT_ROUNDS if set, else the calibrated cost kept in ROUNDS_FILE."""
+    global _target_rounds
+    if _target_rounds is None:
+        env = os.environ.get("BCRYPT_ROUNDS")
+        _target_rounds = int(env) if env else _stored_rounds()
+    return _target_rounds
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the calling (Streamlit script) thread in a bounded pool.
+
+    submit_hash / submit_verify return concurrent.futures.Future objects;
+    hash_password / verify_password block for the result and
+    hash_password_async / verify_password_async can be awaited. When
+    max_pending jobs are already in flight, new work raises HasherBusy
+    immediately rather than growing the queue.
+
+    use_processes=False runs on threads instead (bcrypt releases the GIL),
+    for hosts where child processes are not available. rounds=None uses
+    target_rounds() the first time a hash is made.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, max_pending: int = MAX_PENDING,
+                 rounds: int = None, use_processes: bool = True):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.use_processes = use_processes
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "rejected": 0, "peak_pending": 0}
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self.stats["completed"] += 1
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise HasherBusy(f"{self._pending} password jobs already pending")
+            self._pending += 1
+            self.stats["submitted"] += 1
+            self.stats["peak_pending"] = max(self.stats["peak_pending"], self._pending)
+            executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def target_rounds(self):
+        return self.rounds if self.rounds is not None else target_rounds()
+
+    def needs_rehash(self, hashed: str):
+        """
+        True when a stored hash should be remade at the target cost: when it
+        is weaker than the target, or at any other cost if the cost is pinned
+        (rounds given here or BCRYPT_ROUNDS set).
+        """
+        current = hash_rounds(hashed)
+        if current is None:
+            return True
+        if self.rounds is not None or rounds_pinned():
+            return current != self.target_rounds()
+        return current < self.target_rounds()
+
+    def submit_hash(self, password: str, rounds: int = None):
+        return self._submit(_hashpw, password.encode("utf-8"), rounds or self.target_rounds())
+
+    def submit_verify(self, password: str, hashed: str):
+        return self._submit(_checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    @staticmethod
+    def _result(future, timeout: float):
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()   # drops it if still queued; a running job just finishes
+            raise HasherBusy(f"password job did not finish within {timeout:g}s") from None
+
+    def hash_password(self, password: str, rounds: int = None, timeout: float = HASH_TIMEOUT):
+        return self._result(self.submit_hash(password, rounds), timeout)
+
+    def verify_password(self, password: str, hashed: str, timeout: float = HASH_TIMEOUT):
+        return self._result(self.submit_verify(password, hashed), timeout)
+
+    async def hash_password_async(self, password: str, rounds: int = None):
+        return await asyncio.wrap_future(self.submit_hash(password, rounds))
+
+    async def verify_password_async(self, password: str, hashed: str):
+        return await asyncio.wrap_future(self.submit_verify(password, hashed))
+
+    def snapshot(self):
+        """Copy of the counters plus the current queue depth."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending"] = self._pending
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+password_hasher = PasswordHasher()
+
+
+def hasher_stats():
+    """Counters for the shared password hasher."""
+    return password_hasher.snapshot()
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+
+# (burst, seconds per refilled token) for each kind of key.
+USER_BUCKET = (5, 30.0)          # 5 quick tries per username, then 1 per 30s
+CLIENT_BUCKET = (20, 3.0)        # 20 quick tries per client, then 1 per 3s
+
+# Consecutive failures before lockout, and its length: BASE * 2**(n - threshold),
+# capped at MAX. Clients get more slack since many analysts can share an IP.
+LOCKOUT_THRESHOLD = {"user": 5, "client": 20}
+LOCKOUT_BASE = 30.0
+LOCKOUT_MAX = 3600.0
+
+# Keys tracked in memory before the least recently seen are dropped.
+MAX_KEYS = 10000
+
+
+class LoginRateLimiter:
+    """
+    Token buckets plus exponential lockout, per username and per client.
+
+    check() runs before any lookup or bcrypt work and spends one token from
+    each bucket; it returns (allowed, retry_after_seconds). Report results
+    with record_failure() / record_success(): failures past
+    LOCKOUT_THRESHOLD lock the key out for exponentially longer, a success
+    clears the username's failures.
+
+    With a connection factory (e.g. db.get_connection), state of keys that
+    failed is written to the login_throttle table and reloaded for keys not
+    in memory, so lockouts survive a restart.
+    """
+
+    def __init__(self, user_bucket=USER_BUCKET, client_bucket=CLIENT_BUCKET,
+                 max_keys: int = MAX_KEYS, connect=None):
+        self.buckets = {"user": user_bucket, "client": client_bucket}
+        self.max_keys = max_keys
+        self.connect = connect
+        self._state = OrderedDict()      # key -> [tokens, updated_at, failures, locked_until]
+        self._lock = threading.Lock()
+        self.stats = {"allowed": 0, "rejected_user": 0, "rejected_client": 0,
+                      "failures": 0, "lockouts": 0}
+
+    def _load(self, key):
+        if self.connect is None:
+            return None
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT tokens, updated_at, failures, locked_until FROM login_throttle WHERE key = ?",
+                (key,)
+            )
+            row = cursor.fetchone()
+        return list(row) if row else None
+
+    def _save(self, key, state):
+        if self.connect is None:
+            return
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO login_throttle (key, tokens, updated_at, failures, locked_until)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    tokens = excluded.tokens,
+                    updated_at = excluded.updated_at,
+                    failures = excluded.failures,
+                    locked_until = excluded.locked_until
+                """,
+                (key, *state)
+            )
+            conn.commit()
+
+    def _fetch_missing(self, keys):
+        """
+        Stored state for those keys not in memory, read from the database
+        without holding the lock so one key's I/O never blocks other logins.
+        """
+        if self.connect is None:
+            return {}
+        with self._lock:
+            missing = [key for key in keys if key not in self._state]
+        return {key: self._load(key) for key in missing}
+
+    def _get(self, key, now, loaded):
+        """
+        Refilled state for key; caller holds the lock. loaded is
+        _fetch_missing() output, used only if no other thread has put the
+        key in memory since (its in-memory state is newer).
+        """
+        kind = key.split(":", 1)[0]
+        burst, per_token = self.buckets[kind]
+        state = self._state.get(key)
+        if state is None:
+            state = loaded.get(key) or [float(burst), now, 0, 0.0]
+            self._state[key] = state
+            while len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        self._state.move_to_end(key)
+        state[0] = min(float(burst), state[0] + (now - state[1]) / per_token)
+        state[1] = now
+        return state
+
+    def _keys(self, username, client):
+        keys = []
+        if username:
+            keys.append(f"user:{username.lower()}")
+        if client:
+            keys.append(f"client:{client}")
+        return keys
+
+    def check(self, username, client=None):
+        """Spend one attempt; (False, retry_after) if locked out or out of tokens."""
+        keys = self._keys(username, client)
+        loaded = self._fetch_missing(keys)
+        now = time.time()
+        with self._lock:
+            states = [(key, self._get(key, now, loaded)) for key in keys]
+            for key, state in states:
+                wait = 0.0
+                if state[3] > now:
+                    wait = state[3] - now
+                elif state[0] < 1.0:
+                    wait = (1.0 - state[0]) * self.buckets[key.split(":", 1)[0]][1]
+                if wait > 0:
+                    self.stats["rejected_" + key.split(":", 1)[0]] += 1
+                    return False, wait
+            for _, state in states:
+                state[0] -= 1.0
+            self.stats["allowed"] += 1
+        return True, 0.0
+
+    def record_failure(self, username, client=None):
+        keys = self._keys(username, client)
+        loaded = self._fetch_missing(keys)
+        now = time.time()
+        dirty = []
+        with self._lock:
+            self.stats["failures"] += 1
+            for key in keys:
+                state = self._get(key, now, loaded)
+                threshold = LOCKOUT_THRESHOLD[key.split(":", 1)[0]]
+                state[2] += 1
+                if state[2] >= threshold:
+                    lockout = min(LOCKOUT_MAX, LOCKOUT_BASE * 2 ** (state[2] - threshold))
+                    state[3] = now + lockout
+                    self.stats["lockouts"] += 1
+                dirty.append((key, tuple(state)))
+        for key, state in dirty:
+            self._save(key, state)
+
+    def record_success(self, username, client=None):
+        """Clear the username's failure streak (the client's is left alone)."""
+        keys = self._keys(username, None)
+        with self._lock:
+            states = [(key, self._state.get(key)) for key in keys]
+        for key, state in states:
+            if state is not None and (state[2] or state[3]):
+                with self._lock:
+                    state[2], state[3] = 0, 0.0
+                    snapshot = tuple(state)
+                self._save(key, snapshot)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["tracked_keys"] = len(self._state)
+            stats["locked_out"] = sum(1 for s in self._state.values() if s[3] > time.time())
+        return stats
+
+
+def format_retry(seconds: float):
+    seconds = int(seconds + 0.999)
+    return f"{seconds}s" if seconds < 120 else f"{seconds // 60} min"
@@ -1,9 +1,28 @@
-import bcrypt
+import re
+import sqlite3
+import time
 from pathlib import Path
 
-from ..data.users import get_user_by_username, insert_user
+from ..data.users import get_user_by_username, insert_user, update_password_hash
 from ..data.schema import create_users_table
-from ..data.db import connect_database
+from ..data.db import get_connection
+from ..data.cache import bump_table_version
+from .password_hasher import password_hasher, HasherBusy
+from .rate_limiter import LoginRateLimiter, format_retry
+
+BUSY_MESSAGE = "Too many sign-in requests right now. Please try again in a moment."
+
+# Failed-login state is written to login_throttle (schema migration 5) so
+# lockouts survive a restart; set False to keep it in memory only.
+PERSIST_LOGIN_THROTTLE = True
+
+login_limiter = LoginRateLimiter(connect=get_connection if PERSIST_LOGIN_THROTTLE else None)
+
+# Lines per INSERT batch/transaction in migrate_users_from_file.
+MIGRATION_BATCH = 10000
+
+# $2b$<cost>$ + 22-char salt + 31-char digest
+BCRYPT_HASH_RE = re.compile(r"^\$2[abxy]?\$\d{2}\$[./A-Za-z0-9]{53}$")
 
 
 def register_user(username: str, password: str, role: str = "user"):
@@ -18,79 +37,155 @@ def register_user(username: str, password: str, role: str = "user"):
     if existing:
         return False, f"User '{username}' already exists."
 
-    password_hash = bcrypt.hashpw(
-        password.encode("utf-8"),
-        bcrypt.gensalt()
-    ).decode("utf-8")
+    try:
+        password_hash = password_hasher.hash_password(password)
+    except HasherBusy:
+        return False, BUSY_MESSAGE
 
-    insert_user(username, password_hash, role)
+    try:
+        insert_user(username, password_hash, role)
+    except sqlite3.IntegrityError:
+        # registered concurrently since the lookup above
+        return False, f"User '{username}' already exists."
     return True, f"User '{username}' registered successfully."
 
 
-def login_user(username: str, password: str):
+def authenticate(username: str, password: str, client: str = None):
     """
-    Validate login.
-    Returns: (success: bool, message: str)
+    Validate login and return the user's profile in the same step:
+    one (cached) user lookup and one bcrypt check.
+    Attempts are rate limited per username and per client (e.g. IP)
+    before any of that work happens.
+    Returns: (success: bool, message: str, profile: dict | None)
+    where profile is {"id", "username", "role"}.
     """
     if not username or not password:
-        return False, "Username and password are required."
+        return False, "Username and password are required.", None
+
+    allowed, retry_after = login_limiter.check(username, client)
+    if not allowed:
+        return False, f"Too many login attempts. Try again in {format_retry(retry_after)}.", None
 
     user = get_user_by_username(username)
     if not user:
-        return False, "User not found."
+        login_limiter.record_failure(username, client)
+        return False, "User not found.", None
 
-    stored_hash = user[2]  # (id, username, password_hash, role)
-    if bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8")):
-        return True, "Login successful!"
-    else:
-        return False, "Incorrect password."
+    try:
+        valid = password_hasher.verify_password(password, user.password_hash)
+    except HasherBusy:
+        return False, BUSY_MESSAGE, None
+    if not valid:
+        login_limiter.record_failure(username, client)
+        return False, "Incorrect password.", None
 
+    login_limiter.record_success(username, client)
+    _rehash_if_needed(username, password, user.password_hash)
+    return True, "Login successful!", user.profile()
 
-def migrate_users_from_file(filepath="DATA/users.txt"):
+
+def login_user(username: str, password: str, client: str = None):
+    """
+    Validate login.
+    Returns: (success: bool, message: str)
+    """
+    success, message, _ = authenticate(username, password, client)
+    return success, message
+
+
+def _rehash_if_needed(username: str, password: str, stored_hash: str):
+    """
+    Re-hash at the current target cost when the stored hash differs, so a
+    deployment can change cost without password resets. Best effort: the
+    login has already succeeded, so a busy pool just defers it to next time.
+    """
+    if not password_hasher.needs_rehash(stored_hash):
+        return
+    try:
+        new_hash = password_hasher.hash_password(password)
+    except HasherBusy:
+        return
+    update_password_hash(username, new_hash)
+
+
+def _parse_user_line(line: str):
+    """(username, password_hash, role) for a users.txt line, or None if malformed."""
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) not in (2, 3) or not parts[0]:
+        return None
+    if not BCRYPT_HASH_RE.match(parts[1]):
+        return None
+    role = parts[2] if len(parts) == 3 and parts[2] else "user"
+    return parts[0], parts[1], role
+
+
+def migrate_users_from_file(filepath="DATA/users.txt", batch_size: int = MIGRATION_BATCH,
+                            progress=None):
     """
     Migrate users from Week 7 users.txt into DB.
 
     Expected format per line:
       username,password_hash,role(optional)
 
-    Returns: number of inserted users
+    The file is streamed and inserted with executemany + INSERT OR IGNORE,
+    one transaction per batch_size lines. Existing usernames (and repeats
+    within the file) count as duplicates; lines without a username or a
+    valid bcrypt hash count as malformed. progress(counts) is called after
+    each batch.
+
+    Returns: {"inserted", "duplicates", "malformed", "lines", "seconds"}
     """
     path = Path(filepath)
+    counts = {"inserted": 0, "duplicates": 0, "malformed": 0, "lines": 0, "seconds": 0.0}
 
     if not path.exists():
         print(f"{filepath} not found. Skipping migration.")
-        return 0
-
-    conn = connect_database()
-    create_users_table(conn)
-
-    migrated = 0
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = [p.strip() for p in line.split(",")]
-            username = parts[0]
-            password_hash = parts[1]
-            role = parts[2] if len(parts) > 2 else "user"
-
-            try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO users (username, password_hash, role)
-                    VALUES (?, ?, ?)
-                    """,
-                    (username, password_hash, role)
-                )
-                migrated += 1
-            except Exception:
-                pass
-
-    conn.commit()
-    conn.close()
-
-    print(f"Migrated {migrated} users from {filepath}")
-    return migrated
\ No newline at end of file
+        return counts
+
+    start = time.perf_counter()
+    sql = "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)"
+
+    def flush(conn, batch):
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.executemany(sql, batch)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        counts["inserted"] += cursor.rowcount
+        counts["duplicates"] += len(batch) - cursor.rowcount
+        if progress is not None:
+            progress(dict(counts))
+
+    with get_connection() as conn:
+        create_users_table(conn)
+        if conn.in_transaction:
+            conn.commit()
+
+        batch = []
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                counts["lines"] += 1
+                row = _parse_user_line(line)
+                if row is None:
+                    counts["malformed"] += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush(conn, batch)
+                    batch = []
+        if batch:
+            flush(conn, batch)
+
+    if counts["inserted"]:
+        bump_table_version("users")
+    counts["seconds"] = time.perf_counter() - start
+
+    print(f"Migrated {counts['inserted']} users from {filepath} "
+          f"({counts['duplicates']} duplicates, {counts['malformed']} malformed)")
+    return counts
@@ -0,0 +1,64 @@
+import streamlit as st
+
+from app.data.users import get_user_by_username
+
+LOGIN_PAGE = "pages/0_Home.py"
+
+# The login lives in st.session_state only. Streamlit cannot set an
+# HttpOnly cookie from a script, and a token readable by page scripts or
+# carried in the URL is worse than none, so a new tab, a reload or a
+# dropped websocket starts a fresh Streamlit session and asks for the
+# password again. Page switches within a session keep the login.
+
+# Query parameter older builds put a session token in; stripped wherever
+# it still appears so it does not linger in history or shared links.
+LEGACY_TOKEN_PARAM = "sid"
+
+
+def _drop_url_token():
+    params = getattr(st, "query_params", None)
+    if params is not None and LEGACY_TOKEN_PARAM in params:
+        del params[LEGACY_TOKEN_PARAM]
+
+
+def _apply(profile):
+    st.session_state.logged_in = profile is not None
+    st.session_state.username = profile["username"] if profile else ""
+    st.session_state.role = profile["role"] if profile else "user"
+    _drop_url_token()
+
+
+def restore_session():
+    """
+    Profile of the user logged in to this browser session, or None. The
+    user row is re-read (through the profile cache) so a deleted user or a
+    role change takes effect on the next page load.
+    """
+    username = st.session_state.get("username") if st.session_state.get("logged_in") else None
+    user = get_user_by_username(username) if username else None
+    profile = user.profile() if user else None
+    _apply(profile)
+    return profile
+
+
+def start_session(profile):
+    """Call after a successful login with the profile from authenticate()."""
+    _apply(profile)
+
+
+def end_session():
+    _apply(None)
+
+
+def require_login(message="You must be logged in to view this page."):
+    """
+    Page guard: returns the logged-in profile, or shows a login prompt and
+    stops the script. Call right after st.set_page_config.
+    """
+    profile = restore_session()
+    if profile is None:
+        st.error(message)
+        if st.button("Go to login page"):
+            st.switch_page(LOGIN_PAGE)
+        st.stop()
+    return profile
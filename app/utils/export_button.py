@@ -0,0 +1,69 @@
+import os
+import threading
+from pathlib import Path
+
+import streamlit as st
+
+from app.data.cache import table_version
+from app.data.db import get_connection
+from app.data.export import EXPORT_FORMATS, available_formats, export_table
+
+# One file per (table, format), overwritten when the table changes, so
+# exports never pile up however many sessions start and end.
+EXPORT_DIR = Path("DATA") / "exports"
+
+_exported = {}         # (table, fmt) -> table_version the file was written at
+_lock = threading.Lock()
+
+
+def export_path(table, fmt):
+    return EXPORT_DIR / f"{table}{EXPORT_FORMATS[fmt][1]}"
+
+
+def ensure_export(table, fmt):
+    """
+    Path of an export of table in fmt that is current for this process,
+    rewriting it first (atomically, via a temp file) if the table changed
+    since it was written. Sessions share the file.
+    """
+    path = export_path(table, fmt)
+    with _lock:
+        version = table_version(table)
+        if _exported.get((table, fmt)) != version or not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            try:
+                with get_connection() as conn:
+                    export_table(conn, table, fmt, tmp)
+                os.replace(tmp, path)
+            except Exception:
+                if tmp.exists():
+                    tmp.unlink()
+                raise
+            _exported[(table, fmt)] = version
+    return path
+
+
+def export_button(key, table, file_stem, label="Prepare export"):
+    """
+    Lazy table export: nothing is read or encoded until the user clicks
+    label, then the table is streamed to EXPORT_DIR (ensure_export) and a
+    download button serves it. The download is rendered on that run only:
+    Streamlit holds a download's bytes in memory for as long as the
+    button is on the page, so other reruns do not keep the file loaded.
+    """
+    fmt = st.selectbox("Format", available_formats(), key=f"{key}_fmt")
+    if not st.button(label, key=f"{key}_prepare"):
+        return
+
+    with st.spinner("Exporting..."):
+        path = ensure_export(table, fmt)
+    mime, ext = EXPORT_FORMATS[fmt]
+    with open(path, "rb") as f:
+        st.download_button(
+            f"Download {fmt.upper()} ({os.path.getsize(path) / 1e6:,.1f} MB)",
+            f,
+            file_name=f"{file_stem}{ext}",
+            mime=mime,
+            key=f"{key}_download",
+        )
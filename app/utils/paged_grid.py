@@ -0,0 +1,42 @@
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+from app.utils.stream_helpers import safe_rerun
+
+
+def paged_grid(key, fetch, page_size=50, reset_on=None, **dataframe_kwargs):
+    """
+    Render one page of a keyset-paginated query with Prev/Next controls.
+
+    fetch(after, page_size) must return a page dict from
+    get_incidents_page / get_tickets_page. The cursor stack lives in
+    st.session_state[key] and is cleared whenever reset_on changes
+    (e.g. pass the active filters). A missing table renders as an empty
+    grid. Returns the page as a DataFrame.
+    """
+    state = st.session_state.get(key)
+    if state is None or state["reset_on"] != reset_on:
+        state = st.session_state[key] = {"cursors": [None], "reset_on": reset_on}
+    cursors = state["cursors"]
+
+    try:
+        page = fetch(cursors[-1], page_size)
+    except sqlite3.Error:
+        page = {"rows": [], "columns": [], "next_cursor": None, "has_more": False}
+    df = pd.DataFrame(page["rows"], columns=page["columns"])
+    st.dataframe(df, **dataframe_kwargs)
+
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("◀ Prev", key=f"{key}_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            safe_rerun()
+    with info_col:
+        st.caption(f"Page {len(cursors)} · {len(df)} rows")
+    with next_col:
+        if st.button("Next ▶", key=f"{key}_next", disabled=not page["has_more"]):
+            cursors.append(page["next_cursor"])
+            safe_rerun()
+    return df
@@ -1,8 +1,24 @@
 import bcrypt
 import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+from app.services.rate_limiter import LoginRateLimiter, format_retry
 
 USER_DATA_FILE = "users.txt"
 
+# In-memory only: the CLI is a single process.
+login_limiter = LoginRateLimiter()
+
 
 def hash_password(plain_text_password):
     """
@@ -26,17 +42,100 @@ def verify_password(plain_text_password, hashed_password):
     # Verify using bcrypt
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
+# username -> stored hash, built from USER_DATA_FILE and refreshed only
+# when the file's mtime/size change.
+_user_index = {}
+_index_stamp = None
+_index_offset = 0
+_index_lock = threading.Lock()
+
+
+def _file_stamp():
+    try:
+        st = os.stat(USER_DATA_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _index_lines(lines):
+    for line in lines:
+        parts = line.strip().split(',')
+        # malformed lines are skipped; the first entry for a username wins
+        if len(parts) != 2 or not parts[0]:
+            continue
+        if parts[0] not in _user_index:
+            _user_index[parts[0]] = parts[1]
+
+
+def _refresh_index():
+    """
+    Bring the in-memory index up to date with USER_DATA_FILE.
+    The file is append-only, so growth is read from the last offset;
+    any other change (rewritten, truncated) triggers a full rebuild.
+    """
+    global _index_stamp, _index_offset
+    stamp = _file_stamp()
+    if stamp == _index_stamp:
+        return
+    if stamp is None:
+        _user_index.clear()
+        _index_stamp, _index_offset = None, 0
+        return
+
+    if _index_stamp is None or stamp[1] <= _index_offset:
+        _user_index.clear()
+        _index_offset = 0
+    with open(USER_DATA_FILE, 'rb') as file:
+        file.seek(_index_offset)
+        data = file.read()
+    if _file_stamp() == stamp:
+        # nothing was appended while reading: EOF ends the last line
+        complete = data
+    else:
+        # a write is in progress; its partial line is picked up next time
+        complete = data[:data.rfind(b'\n') + 1]
+    _index_lines(complete.decode('utf-8').splitlines())
+    _index_offset += len(complete)
+    _index_stamp = stamp
+
+
+def _ends_without_newline():
+    """True if USER_DATA_FILE is non-empty and its last line has no newline."""
+    with open(USER_DATA_FILE, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            return False
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) != b'\n'
+
+
+@contextmanager
+def _locked(file):
+    """Exclusive advisory lock on an open file (no-op where unsupported)."""
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        yield
+
+
 def user_exists(username):
-    """Checks if username exists in the file."""
-    if not os.path.exists(USER_DATA_FILE):
-        return False
-    
-    with open(USER_DATA_FILE, 'r') as file:
-        for line in file:
-            parts = line.strip().split(',')
-            if len(parts) >= 1 and parts[0] == username:
-                return True
-    return False
+    """Checks if username exists in the file (O(1) via the in-memory index)."""
+    with _index_lock:
+        _refresh_index()
+        return username in _user_index
 
 def register_user(username, password):
     """Registers a new user."""
@@ -45,9 +144,20 @@ def register_user(username, password):
         return False
 
     hashed_pw = hash_password(password)
-    
+
     with open(USER_DATA_FILE, 'a') as file:
-        file.write(f"{username},{hashed_pw}\n")
+        with _locked(file), _index_lock:
+            # another process may have registered the name since the check
+            _refresh_index()
+            if username in _user_index:
+                print(f"Error: Username '{username}' already exists.")
+                return False
+            if _ends_without_newline():
+                file.write("\n")
+            file.write(f"{username},{hashed_pw}\n")
+            file.flush()
+            os.fsync(file.fileno())
+            _refresh_index()
         
     print(f"Success: User '{username}' registered successfully!")
     return True
@@ -57,20 +167,18 @@ def login_user(username, password):
     if not os.path.exists(USER_DATA_FILE):
         print("Error: No users registered yet.")
         return False
-    with open(USER_DATA_FILE, 'r') as file:
-        for line in file:
-            try:
-                stored_user, stored_hash = line.strip().split(',')
-                
-                if stored_user == username:
-                    if verify_password(password, stored_hash):
-                        return True
-                    else:
-                        break
-            except ValueError:
-                continue 
-
-    return False
+    allowed, retry_after = login_limiter.check(username)
+    if not allowed:
+        print(f"Error: Too many login attempts. Try again in {format_retry(retry_after)}.")
+        return False
+    with _index_lock:
+        _refresh_index()
+        stored_hash = _user_index.get(username)
+    if stored_hash is None or not verify_password(password, stored_hash):
+        login_limiter.record_failure(username)
+        return False
+    login_limiter.record_success(username)
+    return True
 
 
 def validate_username(username):
@@ -0,0 +1,78 @@
+"""
+Archiving Simulator queries: ArchiveIndex vs the pandas mask + sort.
+
+    python -m benchmarks.bench_archiving [max_rows]
+
+Builds synthetic catalogs of 10k, 100k, 1M and max_rows datasets
+(default 5,000,000). Reports the one-off index build, then the mean time
+of a sweep of slider settings answered by ArchiveIndex.query() against
+the copy + mask + sort_values the page used to run on every rerun, and
+checks both agree on count and savings.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.analytics.archiving import ArchiveIndex, DAY_SECONDS, local_now
+
+# (days since last update, minimum size MB, max row count) slider positions
+SETTINGS = [(365, 100, 1000), (30, 1, 0), (2000, 5000, 100000), (730, 250, 50000), (90, 10, 10)]
+
+
+def synthetic_catalog(n, now, seed=0):
+    rng = np.random.default_rng(seed)
+    updated = now - rng.integers(0, 2500 * DAY_SECONDS, n, dtype=np.int64)
+    df = pd.DataFrame({
+        "dataset_name": [f"dataset_{i}" for i in range(n)],
+        "source": np.array(["s3", "hdfs", "postgres", "api"], dtype=object)[rng.integers(0, 4, n)],
+        "file_size_mb": np.round(rng.lognormal(3.0, 2.0, n), 1),
+        "record_count": rng.integers(0, 200_000, n),
+        "last_updated": pd.to_datetime(updated.astype("datetime64[s]")),
+    })
+    df["age_days"] = (pd.Timestamp(now, unit="s") - df["last_updated"]).dt.days
+    return df
+
+
+def pandas_baseline(df, age, size, rows):
+    candidates = df.copy()
+    mask = (
+        (candidates["age_days"] > age) |
+        ((candidates["file_size_mb"] > size) & (candidates["record_count"] < rows))
+    )
+    results = candidates[mask].sort_values("file_size_mb", ascending=False)
+    return len(results), results["file_size_mb"].sum()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    max_rows = int(argv[0]) if argv else 5_000_000
+
+    print(f"{'rows':>12} {'build':>9} {'query':>10} {'pandas':>10}")
+    sizes = [n for n in (10_000, 100_000, 1_000_000) if n < max_rows] + [max_rows]
+    for n in sizes:
+        now = local_now()
+        df = synthetic_catalog(n, now)
+
+        start = time.perf_counter()
+        index = ArchiveIndex.from_frame(df)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [index.query(*s, top_k=500, now=now) for s in SETTINGS]
+        query = (time.perf_counter() - start) / len(SETTINGS)
+
+        start = time.perf_counter()
+        expected = [pandas_baseline(df, *s) for s in SETTINGS]
+        base = (time.perf_counter() - start) / len(SETTINGS)
+
+        for got, (count, savings) in zip(results, expected):
+            assert got["count"] == count, (got["count"], count)
+            assert np.isclose(got["savings_mb"], savings), (got["savings_mb"], savings)
+
+        print(f"{n:>12,} {build:8.3f}s {query * 1000:8.2f}ms {base * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-row vs batched writes for incidents and tickets.
+
+    python -m benchmarks.bench_batch_writes [rows]
+
+Runs against a throwaway database file opened with connect_database (the
+production pragmas: WAL, synchronous=NORMAL, so commits append to the WAL
+and fsync only at checkpoints) and fully migrated by create_all_tables,
+so every write also pays for the FTS and daily-rollup triggers.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.schema import create_all_tables
+from app.data.incidents import (
+    insert_incident, update_incident, delete_incident,
+    insert_incidents_many, update_incidents_many, delete_incidents_many,
+)
+from app.data.tickets import (
+    insert_ticket, update_ticket, delete_ticket,
+    insert_tickets_many, update_tickets_many, delete_tickets_many,
+)
+
+
+def timed(label, fn, n):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.3f}s  {n / elapsed:10,.0f} rows/s")
+    return elapsed
+
+
+def bench_incidents(conn, n):
+    rows = [(f"Incident {i}", "High", "open", "2024-11-05") for i in range(n)]
+    ids = []
+    timed("insert_incident x n", lambda: ids.extend(insert_incident(conn, *r) for r in rows), n)
+    timed("update_incident x n", lambda: [update_incident(conn, i, status="Closed") for i in ids], n)
+    timed("delete_incident x n", lambda: [delete_incident(conn, i) for i in ids], n)
+
+    result = {}
+    timed("insert_incidents_many", lambda: result.update(ids=insert_incidents_many(conn, rows)[0]), n)
+    timed("update_incidents_many",
+          lambda: update_incidents_many(conn, [{"id": i, "status": "Closed"} for i in result["ids"]]), n)
+    timed("delete_incidents_many", lambda: delete_incidents_many(conn, result["ids"]), n)
+
+
+def bench_tickets(conn, n):
+    rows = [(f"Ticket {i}", "high", "open", "2025-08-25", "ops") for i in range(n)]
+    ids = []
+    timed("insert_ticket x n", lambda: ids.extend(insert_ticket(conn, *r) for r in rows), n)
+    timed("update_ticket x n", lambda: [update_ticket(conn, i, status="closed") for i in ids], n)
+    timed("delete_ticket x n", lambda: [delete_ticket(conn, i) for i in ids], n)
+
+    result = {}
+    timed("insert_tickets_many", lambda: result.update(ids=insert_tickets_many(conn, rows)[0]), n)
+    timed("update_tickets_many",
+          lambda: update_tickets_many(conn, [{"id": i, "status": "closed"} for i in result["ids"]]), n)
+    timed("delete_tickets_many", lambda: delete_tickets_many(conn, result["ids"]), n)
+
+
+def main(n=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect_database(Path(tmp) / "bench.db")
+        create_all_tables(conn)
+        print(f"\nIncidents ({n} rows)")
+        bench_incidents(conn, n)
+        print(f"\nTickets ({n} rows)")
+        bench_tickets(conn, n)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
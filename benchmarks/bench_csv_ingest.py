@@ -0,0 +1,49 @@
+"""
+Streaming CSV ingestion throughput and peak Python memory.
+
+    python -m benchmarks.bench_csv_ingest [rows]
+
+Writes a synthetic incidents CSV, loads it with ingest_csv and reports
+rows/s and the tracemalloc peak, which should stay flat as rows grow
+(tracemalloc itself slows the run; compare rows/s between sizes only).
+"""
+import csv
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from app.data.db import connect_database
+from app.data.schema import create_cyber_incidents_table
+from app.data.ingest import ingest_csv
+
+
+def write_csv(path, n):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "severity", "status", "date"])
+        for i in range(n):
+            writer.writerow([i + 1, f"Phishing Campaign {i}", "High", "open", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"])
+
+
+def main(n=200000):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "incidents.csv"
+        write_csv(csv_path, n)
+        size_mb = csv_path.stat().st_size / 1e6
+        conn = connect_database(Path(tmp) / "bench.db")
+        create_cyber_incidents_table(conn)
+
+        tracemalloc.start()
+        stats = ingest_csv(conn, "cyber_incidents", csv_path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        conn.close()
+
+    print(f"\n{stats['rows']:,} rows ({size_mb:,.1f} MB CSV) in {stats['seconds']:.2f}s "
+          f"-> {stats['rows_per_sec']:,.0f} rows/s, {stats['chunks']} chunks, "
+          f"peak Python memory {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,72 @@
+"""
+bcrypt logins per second against the number of hasher workers.
+
+    python -m benchmarks.bench_login_throughput [logins] [rounds]
+
+Each run verifies the same password `logins` times through a
+PasswordHasher with 1, 2, 4, ... workers up to the core count, after an
+inline (script-thread) baseline. Lower rounds for a quick run.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import bcrypt
+
+from app.services.password_hasher import PasswordHasher
+
+
+def bench_inline(hashed, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        bcrypt.checkpw(b"correct horse", hashed.encode("utf-8"))
+    return time.perf_counter() - start
+
+
+def bench_pool(hashed, n, workers, use_processes):
+    hasher = PasswordHasher(workers=workers, max_pending=n, use_processes=use_processes)
+    hasher.verify_password("correct horse", hashed)          # start the pool outside the timing
+
+    async def burst():
+        return await asyncio.gather(*(
+            hasher.verify_password_async("correct horse", hashed) for _ in range(n)
+        ))
+
+    start = time.perf_counter()
+    results = asyncio.run(burst())
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+    assert all(results)
+    return elapsed
+
+
+def worker_counts():
+    cores = os.cpu_count() or 1
+    counts, w = [], 1
+    while w < cores:
+        counts.append(w)
+        w *= 2
+    counts.append(cores)
+    return counts
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 32
+    rounds = int(argv[1]) if len(argv) > 1 else 12
+    hashed = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(rounds)).decode("utf-8")
+
+    print(f"{n} logins, bcrypt cost {rounds}, {os.cpu_count()} cores")
+    elapsed = bench_inline(hashed, n)
+    print(f"  {'inline':<20} {elapsed:8.3f}s  {n / elapsed:8.1f} logins/s")
+    for use_processes in (True, False):
+        kind = "processes" if use_processes else "threads"
+        for workers in worker_counts():
+            elapsed = bench_pool(hashed, n, workers, use_processes)
+            label = f"{workers} {kind}"
+            print(f"  {label:<20} {elapsed:8.3f}s  {n / elapsed:8.1f} logins/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Per-row memory of incident rows held as tuples, slotted models, the old
+dict-backed class and a DataFrame.
+
+    python -m benchmarks.bench_model_memory [rows]
+
+Fills an in-memory cyber_incidents table with rows incidents (default
+1,000,000), then loads all of them each way and reports the bytes
+tracemalloc sees retained per row (shared strings count once, as in the
+real process; for the DataFrame, at least memory_usage(deep=True)) and
+the load time.
+"""
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from app.data.schema import create_cyber_incidents_table
+from models import SecurityIncident, model_row_factory
+
+
+class LegacyIncident:
+    """The pre-slots SecurityIncident: one __dict__ per instance."""
+    def __init__(self, id, title, severity, status, date, resolved_date=None):
+        self.id = id
+        self.title = title
+        self.severity = severity
+        self.status = status
+        self.date = date
+        self.resolved_date = resolved_date
+
+
+def fill(conn, n):
+    conn.executemany(
+        "INSERT INTO cyber_incidents (title, severity, status, date, resolved_date) VALUES (?, ?, ?, ?, ?)",
+        (
+            (f"Incident {i}", ("High", "Medium", "Low")[i % 3], ("open", "Closed")[i % 2],
+             f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}", None)
+            for i in range(n)
+        ),
+    )
+    conn.commit()
+
+
+def measure(load):
+    """(bytes retained, load seconds); timed in a separate untraced run."""
+    gc.collect()
+    start = time.perf_counter()
+    data = load()
+    elapsed = time.perf_counter() - start
+    del data
+    gc.collect()
+    tracemalloc.start()
+    data = load()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    if isinstance(data, pd.DataFrame):
+        # Arrow-backed string columns live outside the Python allocator
+        retained = max(retained, int(data.memory_usage(deep=True).sum()))
+    del data
+    return retained, elapsed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    rows = int(argv[0]) if argv else 1_000_000
+    columns = "id, title, severity, status, date, resolved_date"
+
+    conn = sqlite3.connect(":memory:")
+    create_cyber_incidents_table(conn)
+    fill(conn, rows)
+
+    def tuples():
+        return conn.execute(f"SELECT {columns} FROM cyber_incidents").fetchall()
+
+    def slotted():
+        cursor = conn.cursor()
+        cursor.row_factory = model_row_factory(SecurityIncident)
+        return cursor.execute(f"SELECT {columns} FROM cyber_incidents").fetchall()
+
+    def legacy():
+        cursor = conn.execute(f"SELECT {columns} FROM cyber_incidents")
+        return [LegacyIncident(*row) for row in cursor]
+
+    def frame():
+        return pd.read_sql_query(f"SELECT {columns} FROM cyber_incidents", conn)
+
+    print(f"{rows:,} incidents")
+    print(f"  {'':<22} {'bytes/row':>10} {'load':>9}")
+    for label, load in (("tuples", tuples), ("slotted dataclass", slotted),
+                        ("dict-backed class", legacy), ("DataFrame", frame)):
+        retained, elapsed = measure(load)
+        print(f"  {label:<22} {retained / rows:10.1f} {elapsed:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
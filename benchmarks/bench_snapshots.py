@@ -0,0 +1,81 @@
+"""
+Analytics reads: Arrow snapshot vs pd.read_sql_query + text date parsing.
+
+    python -m benchmarks.bench_snapshots [rows]
+
+Fills a temporary database with rows it_tickets (default 1,000,000),
+then times the read the IT Operations page used to do (SELECT * and
+pd.to_datetime on both date columns), writing the snapshot once, and
+reading it back memory-mapped, whole and projected to two columns.
+Needs pyarrow.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from app.data import snapshots
+from app.data.db import get_connection, close_all_pools
+from app.data.schema import create_all_tables
+
+
+def fill(conn, n):
+    conn.executemany(
+        "INSERT INTO it_tickets (title, priority, status, created_date, resolved_date, assigned_to) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (f"Ticket {i}", ("low", "medium", "high")[i % 3], ("open", "closed")[i % 2],
+             f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} 09:30:00",
+             f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} 17:00:00" if i % 2 else None,
+             f"analyst{i % 40}")
+            for i in range(n)
+        ),
+    )
+    conn.commit()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    rows = int(argv[0]) if argv else 1_000_000
+    if snapshots.pa is None:
+        print("pyarrow is not installed; nothing to compare")
+        return
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # DB_PATH and SNAPSHOT_DIR are relative to the working directory
+        os.chdir(tmp)
+        os.mkdir("DATA")
+        try:
+            with get_connection() as conn:
+                create_all_tables(conn)
+                fill(conn, rows)
+
+                def sqlite_read():
+                    df = pd.read_sql_query("SELECT * FROM it_tickets", conn)
+                    for col in ("created_date", "resolved_date"):
+                        df[col] = pd.to_datetime(df[col], errors="coerce")
+                    return df
+
+                print(f"{rows:,} tickets")
+                print(f"  read_sql_query + to_datetime  {timed(sqlite_read):8.3f}s")
+            print(f"  write snapshot                {timed(lambda: snapshots.ensure_snapshot('it_tickets')):8.3f}s")
+            print(f"  snapshot -> pyarrow.Table     {timed(lambda: snapshots.read_snapshot('it_tickets')):8.3f}s")
+            print(f"  snapshot -> DataFrame         {timed(lambda: snapshots.snapshot_frame('it_tickets')):8.3f}s")
+            projected = ("created_date", "resolved_date")
+            print(f"  snapshot -> 2-column frame    {timed(lambda: snapshots.snapshot_frame('it_tickets', projected)):8.3f}s")
+        finally:
+            close_all_pools()
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Vectorized ticket analytics vs the pandas groupby version at scale.
+
+    python -m benchmarks.bench_ticket_analytics [max_rows]
+
+Builds synthetic column arrays (as load_ticket_columns would return) for
+10k rows up to max_rows (default 10,000,000), growing 10x per step, and
+times ticket_stats(). The pandas baseline (datetime math + groupbys +
+full sort, as pages/3_IT_Operations.py used to do) runs up to 1M rows.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.analytics.tickets import ticket_stats, MISSING, DAY_SECONDS
+
+STATUSES = ["open", "in_progress", "waiting_user", "closed"]
+PRIORITIES = ["low", "medium", "high", "urgent"]
+PANDAS_MAX_ROWS = 1_000_000
+
+
+def synthetic_columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    now = int(time.time())
+    created = now - rng.integers(0, 730 * DAY_SECONDS, n, dtype=np.int64)
+    status = rng.integers(0, len(STATUSES), n).astype(np.int32)
+    resolved = created + rng.integers(3600, 30 * DAY_SECONDS, n, dtype=np.int64)
+    resolved[status != STATUSES.index("closed")] = MISSING
+    return {
+        "id": np.arange(1, n + 1, dtype=np.int64),
+        "created": created,
+        "resolved": resolved,
+        "status": status,
+        "status_labels": STATUSES,
+        "priority": rng.integers(0, len(PRIORITIES), n).astype(np.int32),
+        "priority_labels": PRIORITIES,
+        "assignee": rng.integers(0, 50, n).astype(np.int32),
+        "assignee_labels": [f"analyst{i}" for i in range(50)],
+    }
+
+
+def pandas_baseline(cols):
+    # MISSING is int64 min, which numpy reads as NaT
+    created, resolved = cols["created"], cols["resolved"]
+    df = pd.DataFrame({
+        "id": cols["id"],
+        "status": np.array(cols["status_labels"], dtype=object)[cols["status"]],
+        "assigned_to": np.array(cols["assignee_labels"], dtype=object)[cols["assignee"]],
+        "created_date": pd.to_datetime(created.astype("datetime64[s]")),
+        "resolved_date": pd.to_datetime(resolved.astype("datetime64[s]")),
+    })
+    df["age_days"] = (pd.Timestamp.now() - df["created_date"]).dt.total_seconds() / 86400.0
+    df["resolution_days"] = (df["resolved_date"] - df["created_date"]).dt.total_seconds() / 86400.0
+    open_df = df[df["status"].str.lower() != "closed"]
+    open_df.groupby("status")["age_days"].mean()
+    resolved_df = df[df["resolution_days"].notna()]
+    resolved_df.groupby("assigned_to")["resolution_days"].quantile([0.5, 0.9])
+    df.sort_values("resolution_days", ascending=False).head(10)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    max_rows = int(argv[0]) if argv else 10_000_000
+
+    print(f"{'rows':>12} {'ticket_stats':>14} {'pandas':>10}")
+    n = 10_000
+    while n <= max_rows:
+        cols = synthetic_columns(n)
+        vec = timed(ticket_stats, cols)
+        base = f"{timed(pandas_baseline, cols):9.3f}s" if n <= PANDAS_MAX_ROWS else f"{'-':>10}"
+        print(f"{n:>12,} {vec:13.3f}s {base}")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,26 @@
-from app.data.db import connect_database
+import time
+
+from app.data.db import get_connection, pool_stats
 from app.data.schema import create_all_tables
+from app.data.bootstrap import bootstrap_tables, count_rows
 from app.services.user_service import register_user, login_user, migrate_users_from_file
-from app.data.incidents import insert_incident, get_all_incidents, get_incident_by_id, update_incident, delete_incident, load_cyber_incidents_csv 
-from app.data.datasets import get_all_datasets, load_datasets_metadata_csv
-from app.data.tickets import get_all_tickets, load_it_tickets_csv
+from app.data.incidents import insert_incident, get_incident_by_id, update_incident, delete_incident
 
 def main():
     print("---Starting System Setup ---")
+    stage_times = {}
     
-    conn = connect_database()
-    create_all_tables(conn)
+    t0 = time.perf_counter()
+    with get_connection() as conn:
+        create_all_tables(conn)
     print("✅ Database tables created (if not existing).")
+    stage_times["schema"] = time.perf_counter() - t0
     
+    t0 = time.perf_counter()
     try:
         migrated = migrate_users_from_file()
-        print(f"✅ Migrated {migrated} users from DATA/users.txt")
+        print(f"✅ Migrated {migrated['inserted']} users from DATA/users.txt "
+              f"({migrated['duplicates']} duplicates, {migrated['malformed']} malformed)")
     except Exception as e:
         print(f"User migration skipped or failed: {e}")
     
@@ -24,73 +30,56 @@ def main():
         print(f"User 'alice' created: {msg}")
     else:
         print("User 'alice' already exists.")
+    stage_times["users"] = time.perf_counter() - t0
 
-    conn = connect_database()
-    try:
-        incidents_present = len(get_all_incidents(conn))
-        if incidents_present == 0:
-            loaded_rows = load_cyber_incidents_csv(conn, force=True)
-            print(f"✅ Loaded {loaded_rows} cyber incidents from CSV")
-        else:
-            print(f"ℹcyber_incidents already has {incidents_present} rows; skipping CSV load")
-    except Exception as e:
-        print(f"Error loading Cyber CSV: {e}")
+    with get_connection() as conn:
+        t0 = time.perf_counter()
+        result = bootstrap_tables(conn)
+        for table, rows in result["loaded"].items():
+            print(f"✅ Loaded {rows} rows into {table} from CSV")
+        for table in result["skipped"]:
+            print(f"ℹ {table} already has rows; skipping CSV load")
+        for table, error in result["errors"].items():
+            print(f"Error loading {table}: {error}")
+        print("Bootstrap timings: " + ", ".join(f"{k}={v:.3f}s" for k, v in result["timings"].items()))
+        stage_times["bootstrap"] = time.perf_counter() - t0
 
-    try:
-        incident_id = insert_incident(
-            conn,
-            "Test Phishing Incident",   # title
-            "High",                     # severity
-            "open",                     # status
-            "2024-11-05"                # date
-        )
-        print(f"✅ CRUD Test: Created incident #{incident_id}")
+        t0 = time.perf_counter()
+        try:
+            incident_id = insert_incident(
+                conn,
+                "Test Phishing Incident",   # title
+                "High",                     # severity
+                "open",                     # status
+                "2024-11-05"                # date
+            )
+            print(f"✅ CRUD Test: Created incident #{incident_id}")
         
-        update_incident(conn, incident_id, status="Closed")
-        after_update = get_incident_by_id(conn, incident_id)
-        if after_update and after_update[3] == "Closed": # Assuming index 3 is status
-            print("CRUD Test: Update successful (Status is Closed)")
-        else:
-            print(f"CRUD Test: Update check result: {after_update}")
+            update_incident(conn, incident_id, status="Closed")
+            after_update = get_incident_by_id(conn, incident_id)
+            if after_update and after_update.status == "Closed":
+                print("CRUD Test: Update successful (Status is Closed)")
+            else:
+                print(f"CRUD Test: Update check result: {after_update}")
 
-        delete_incident(conn, incident_id)
-        after_delete = get_incident_by_id(conn, incident_id)
-        if after_delete is None:
-            print("CRUD Test: Delete successful")
-        else:
-            print("CRUD Test: Delete failed")
+            delete_incident(conn, incident_id)
+            after_delete = get_incident_by_id(conn, incident_id)
+            if after_delete is None:
+                print("CRUD Test: Delete successful")
+            else:
+                print("CRUD Test: Delete failed")
             
-    except Exception as e:
-        print(f"CRUD Test Error: {e}")
-
-    datasets_present = len(get_all_datasets())
-    if datasets_present == 0:
-        loaded_datasets = load_datasets_metadata_csv(conn, force=True)
-        print(f"Loaded {loaded_datasets} datasets from CSV")
-    else:
-        print(f"datasets_metadata already has {datasets_present} rows.")
-
-    try:
-        tickets_present = len(get_all_tickets(conn))
-        if tickets_present == 0:
-            loaded_tickets = load_it_tickets_csv(conn, force=True)
-            print(f"Loaded {loaded_tickets} IT tickets from CSV")
-        else:
-            print(f"it_tickets already has {tickets_present} rows.")
-    except Exception as e:
-        print(f"Error loading IT Tickets: {e}")
-
-    print("---  Data Summary ---")
-    incidents = get_all_incidents(conn)
-    print(f"Total Cyber Incidents: {len(incidents)}")
+        except Exception as e:
+            print(f"CRUD Test Error: {e}")
+        stage_times["crud_test"] = time.perf_counter() - t0
 
-    datasets = get_all_datasets()
-    print(f"Total Datasets: {len(datasets)}")
+        print("---  Data Summary ---")
+        print(f"Total Cyber Incidents: {count_rows(conn, 'cyber_incidents')}")
+        print(f"Total Datasets: {count_rows(conn, 'datasets_metadata')}")
+        print(f"Total IT Tickets: {count_rows(conn, 'it_tickets')}")
 
-    tickets = get_all_tickets(conn)
-    print(f"Total IT Tickets: {len(tickets)}")
-    
-    conn.close()
+    print("Stage timings: " + ", ".join(f"{k}={v:.3f}s" for k, v in stage_times.items()))
+    print(f"Connection pool: {pool_stats()}")
     print("--- Setup Complete ---")
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+from .security_incident import SecurityIncident
+from .it_ticket import ITTicket
+from .dataset import Dataset
+from .user import User
+from .row_factory import model_row_factory
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Dataset:
+    """One datasets_metadata row."""
+    id: int
+    dataset_name: str
+    category: str
+    source: str
+    last_updated: str = None
+    record_count: int = None
+    file_size_mb: float = None
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ITTicket:
+    """One it_tickets row."""
+    id: int
+    title: str
+    priority: str
+    status: str = "open"
+    created_date: str = None
+    resolved_date: str = None
+    assigned_to: str = None
+
+    def is_closed(self):
+        return (self.status or "").lower() == "closed"
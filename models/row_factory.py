@@ -0,0 +1,48 @@
+import dataclasses
+from operator import itemgetter
+
+
+def model_row_factory(model):
+    """
+    sqlite3 row factory that builds model (a dataclass) straight from a
+    cursor: columns are matched to fields by name, extra columns are
+    ignored and missing ones take the field default (fields without a
+    default must be selected).
+
+        cursor = conn.cursor()
+        cursor.row_factory = model_row_factory(SecurityIncident)
+
+    The column -> field mapping is worked out once per statement (the
+    cursor's description), not per row.
+    """
+    fields = [f.name for f in dataclasses.fields(model)]
+    last = [(None, None)]   # (description, build function), swapped as one tuple
+
+    def layout(description):
+        columns = {d[0]: i for i, d in enumerate(description)}
+        present = [name for name in fields if name in columns]
+        missing = [name for name in fields if name not in columns]
+        indexes = [columns[name] for name in present]
+        if not indexes:
+            return lambda row: model()
+        getter = itemgetter(*indexes)
+        positional = not missing or fields[:len(present)] == present
+        if len(indexes) == 1:
+            name = present[0]
+            if positional:
+                return lambda row: model(getter(row))
+            return lambda row: model(**{name: getter(row)})
+        if positional:
+            # leading fields, in declaration order: pass them positionally
+            return lambda row: model(*getter(row))
+        return lambda row: model(**dict(zip(present, getter(row))))
+
+    def factory(cursor, row):
+        description, build = last[0]
+        if description is not cursor.description:
+            description = cursor.description
+            build = layout(description)
+            last[0] = (description, build)
+        return build(row)
+
+    return factory
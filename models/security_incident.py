@@ -1,11 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
 class SecurityIncident:
-    def __init__(self, id, title, severity, status, date, resolved_date=None):
-        self.id = id
-        self.title = title
-        self.severity = severity
-        self.status = status
-        self.date = date
-        self.resolved_date = resolved_date
+    """One cyber_incidents row. Slotted: no per-instance __dict__."""
+    id: int
+    title: str
+    severity: str
+    status: str = "open"
+    date: str = None
+    resolved_date: str = None
+    incident_category: str = None
 
     def is_critical(self):
-        return self.severity == "High" and self.status == "Open"
\ No newline at end of file
+        return self.severity == "High" and self.status == "Open"
+
+    def is_closed(self):
+        return (self.status or "").lower() == "closed"
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class User:
+    """One users row, password hash included; see profile() for what to expose."""
+    id: int
+    username: str
+    password_hash: str
+    role: str = "user"
+
+    def profile(self):
+        """The {"id", "username", "role"} dict used by login and the page guard."""
+        return {"id": self.id, "username": self.username, "role": self.role or "user"}
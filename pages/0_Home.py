@@ -11,11 +11,14 @@ if "username" not in st.session_state:
 if "role" not in st.session_state:
     st.session_state.role = "user"
 
-from app.data.db import connect_database
-from app.data.schema import create_users_table
-conn = connect_database()
-create_users_table(conn)
-conn.close()
+from app.data.db import get_connection
+from app.data.schema import create_all_tables
+from app.utils.auth_guard import restore_session, start_session
+with get_connection() as conn:
+    create_all_tables(conn)
+
+# a rerun or page switch in this browser session keeps the login
+restore_session()
 
 st.title("🔐 Welcome")
 
@@ -33,15 +36,13 @@ with tab_login:
     login_password = st.text_input("Password", type="password", key="login_password")
 
     if st.button("Log in", type="primary"):
-        from app.services.user_service import login_user
-        from app.data.users import get_user_by_username
+        from app.services.user_service import authenticate
 
-        success, msg = login_user(login_username, login_password)
+        context = getattr(st, "context", None)
+        client = getattr(context, "ip_address", None)
+        success, msg, profile = authenticate(login_username, login_password, client)
         if success:
-            st.session_state.logged_in = True
-            st.session_state.username = login_username
-            user = get_user_by_username(login_username)
-            st.session_state.role = user[3] if user and len(user) > 3 else "user"
+            start_session(profile)
             st.success(f"Welcome back, {login_username}! ")
             st.switch_page("pages/1_dashboard.py")
         else:
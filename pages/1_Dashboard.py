@@ -6,22 +6,17 @@ import os
 
 sys.path.append(os.getcwd())
 
-from app.data.db import connect_database
-from app.data.incidents import insert_incident, get_all_incidents, update_incident, delete_incident
+from app.data.db import get_connection
+from app.data.incidents import insert_incident, get_incidents_page, update_incident, delete_incident
+from app.data.metrics import dashboard_kpis
 from app.utils.stream_helpers import safe_rerun
+from app.utils.paged_grid import paged_grid
+from app.utils.export_button import export_button
+from app.utils.auth_guard import require_login, end_session, LOGIN_PAGE
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
-if "username" not in st.session_state:
-    st.session_state.username = ""
-
-if not st.session_state.logged_in:
-    st.error("You must be logged in to view the dashboard.")
-    if st.button("Go to login page"):
-        st.switch_page("pages/1_🔒_Login.py") 
-    st.stop()
+require_login("You must be logged in to view the dashboard.")
 
 st.markdown(
     f"""
@@ -57,41 +52,21 @@ with st.sidebar:
         safe_rerun()
     st.divider()
     if st.button("Log out"):
-        st.session_state.logged_in = False
-        st.session_state.username = ""
+        end_session()
         st.info("You have been logged out.")
-        st.switch_page("pages/1_🔒_Login.py")
-
-conn = connect_database()
-try:
-    inc_df = pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
-except Exception:
-    inc_df = pd.DataFrame()
-try:
-    tickets_df = pd.read_sql_query("SELECT * FROM it_tickets", conn)
-except Exception:
-    tickets_df = pd.DataFrame()
-try:
-    datasets_df = pd.read_sql_query("SELECT * FROM datasets_metadata", conn)
-except Exception:
-    datasets_df = pd.DataFrame()
-conn.close()
-
-now = pd.Timestamp.now()
-inc_total = len(inc_df)
-inc_open = inc_df[inc_df.get("status", "").str.lower() == "open"].shape[0] if not inc_df.empty else 0
-
-phishing_recent = 0
-if not inc_df.empty:
-    if "category" in inc_df.columns:
-        phishing_recent = inc_df[inc_df["category"].str.contains("phish", case=False, na=False)].shape[0]
-    elif "title" in inc_df.columns:
-        phishing_recent = inc_df[inc_df["title"].str.contains("phish", case=False, na=False)].shape[0]
-
-tickets_total = len(tickets_df)
-tickets_open = tickets_df[tickets_df.get("status", "").str.lower() == "open"].shape[0] if not tickets_df.empty else 0
-
-datasets_size_mb = datasets_df.get("file_size_mb", pd.Series([0.0])).sum() if not datasets_df.empty else 0.0
+        st.switch_page(LOGIN_PAGE)
+
+with get_connection() as conn:
+    kpis = dashboard_kpis(conn)
+
+inc_total = kpis["incidents"]["total"]
+inc_open = kpis["incidents"]["open"]
+phishing_recent = kpis["incidents"]["phishing"]
+
+tickets_total = kpis["tickets"]["total"]
+tickets_open = kpis["tickets"]["open"]
+
+datasets_size_mb = kpis["datasets"]["total_mb"]
 
 cols = st.columns(4)
 for i, (title, value, delta) in enumerate([
@@ -128,33 +103,18 @@ with left:
         i_status = st.selectbox("Status", ["open","Closed","Investigating"], index=0, key="new_inc_status")
         i_date = st.date_input("Date", key="new_inc_date")
         if st.form_submit_button("Create Incident"):
-            conn = connect_database()
-            insert_incident(conn, i_title, i_severity, i_status, i_date.isoformat())
-            conn.close()
+            with get_connection() as conn:
+                insert_incident(conn, i_title, i_severity, i_status, i_date.isoformat())
             st.success("Incident created")
             safe_rerun()
 
-    incidents = []
-    try:
-        conn2 = connect_database()
-        incidents = get_all_incidents(conn2)
-        conn2.close()
-    except Exception:
-        incidents = []
-
-    if incidents:
-        first_row_len = len(incidents[0])
-        if first_row_len == 7:
-             cols = ["id","title","severity","status","date","resolved_date","created_at"]
-        elif first_row_len == 6:
-             cols = ["id","title","severity","status","date","resolved_date"]
-        else:
-             cols = None # Let pandas auto-number columns
-        
-        inc_df_local = pd.DataFrame(incidents, columns=cols)
-        
-        st.dataframe(inc_df_local, width='stretch')
+    def fetch_incidents(after, page_size):
+        with get_connection() as conn2:
+            return get_incidents_page(conn2, after=after, page_size=page_size)
+
+    inc_df_local = paged_grid("dash_inc_grid", fetch_incidents, width='stretch')
 
+    if not inc_df_local.empty:
         if "id" in inc_df_local.columns:
             sel = st.selectbox("Select incident to manage", options=inc_df_local["id"].tolist(), key="sel_inc")
             if not inc_df_local[inc_df_local["id"]==sel].empty:
@@ -173,25 +133,23 @@ with left:
                     e_status = st.selectbox("Status", stat_opts, index=stat_opts.index(curr_stat), key="edit_inc_status")
                     
                     if st.form_submit_button("Update Incident"):
-                        conn = connect_database()
-                        update_incident(conn, int(sel), title=e_title, severity=e_severity, status=e_status)
-                        conn.close()
+                        with get_connection() as conn:
+                            update_incident(conn, int(sel), title=e_title, severity=e_severity, status=e_status)
                         st.success("Incident updated")
                         safe_rerun()
                     if st.form_submit_button("Delete Incident"):
-                        conn = connect_database()
-                        delete_incident(conn, int(sel))
-                        conn.close()
+                        with get_connection() as conn:
+                            delete_incident(conn, int(sel))
                         st.warning("Incident deleted")
                         safe_rerun()
 
 with right:
     st.subheader("Distribution")
-    if not inc_df.empty and "severity" in inc_df.columns:
+    by_severity = kpis["incidents"]["by_severity"]
+    if by_severity:
         st.write("Incidents by Severity")
-        st.bar_chart(inc_df["severity"].value_counts())
+        st.bar_chart(pd.Series(by_severity, name="count").sort_values(ascending=False))
     
     st.divider()
     st.subheader("Quick Actions")
-    csv = inc_df.to_csv(index=False)
-    st.download_button("Download Incident Data", csv, file_name="dashboard_data.csv", mime="text/csv")
\ No newline at end of file
+    export_button("dashboard_export", "cyber_incidents", "dashboard_data", label="Export Incident Data")
\ No newline at end of file
@@ -5,11 +5,16 @@ import os
 
 sys.path.append(os.getcwd())
 
-from app.data.db import connect_database
-from app.data.incidents import insert_incident, get_all_incidents, update_incident, delete_incident
+from app.data.db import get_connection
+from app.data.incidents import insert_incident, get_incidents_page, search_incidents, update_incident, delete_incident
+from app.data.metrics import incident_kpis, incidents_per_day, daily_spikes
 from app.utils.stream_helpers import safe_rerun
+from app.utils.paged_grid import paged_grid
+from app.utils.auth_guard import require_login
 from models.security_incident import SecurityIncident 
 
+require_login()
+
 def cyber_hub_ui():
     st.markdown(
         """
@@ -21,16 +26,18 @@ def cyber_hub_ui():
         unsafe_allow_html=True,
     )
 
-    conn = connect_database()
-    try:
-        df = pd.read_sql_query("SELECT * FROM cyber_incidents", conn)
-    except Exception:
-        df = pd.DataFrame()
-    conn.close()
+    with get_connection() as conn:
+        kpis = incident_kpis(conn)
+        per_day = incidents_per_day(conn)
+        phishing_per_day = incidents_per_day(conn, phishing_only=True)
+        try:
+            sample = pd.read_sql_query("SELECT * FROM cyber_incidents ORDER BY date DESC LIMIT 20", conn)
+        except Exception:
+            sample = pd.DataFrame()
 
-    total = len(df)
-    high = df[df.get("severity", "").str.lower() == "high"].shape[0] if not df.empty else 0
-    open_cnt = df[df.get("status", "").str.lower() == "open"].shape[0] if not df.empty else 0
+    total = kpis["total"]
+    high = kpis["high"]
+    open_cnt = kpis["open"]
 
     c1, c2, c3 = st.columns(3)
     c1.metric("Total Incidents", total)
@@ -40,54 +47,38 @@ def cyber_hub_ui():
     st.markdown("---")
     st.subheader("Incidents — Analytics & Management")
 
-    conn = connect_database()
-    try:
-        full = pd.read_sql_query("SELECT * FROM cyber_incidents ORDER BY date DESC", conn)
-    except Exception:
-        full = pd.DataFrame()
-    conn.close()
-
     st.markdown("---")
     st.subheader("Incidents by Severity & Trends")
     left, right = st.columns([2, 1])
     with left:
-        if full.empty:
+        if total == 0:
             st.info("No incidents available.")
         else:
-            if "severity" in full.columns:
-                st.bar_chart(full["severity"].value_counts())
-            if "date" in full.columns:
-                full["date"] = pd.to_datetime(full["date"], errors="coerce")
-                ts = full.groupby(full["date"].dt.to_period("D")).size().sort_index()
-                st.line_chart(ts)
+            if kpis["by_severity"]:
+                st.bar_chart(pd.Series(kpis["by_severity"], name="count").sort_values(ascending=False))
+            if not per_day.empty:
+                st.line_chart(per_day)
     with right:
         st.subheader("Sample Incidents")
-        st.dataframe(full.head(20), width='stretch')
+        st.dataframe(sample, width='stretch')
+        if kpis["by_category"]:
+            st.subheader("By Category")
+            st.bar_chart(pd.Series(kpis["by_category"], name="count").sort_values(ascending=False))
 
     st.markdown("---")
     st.subheader("Phishing Spike & Response Bottleneck")
 
-    if full.empty:
+    if total == 0:
         st.info("No incidents to analyze.")
     else:
-        for col in ["date", "created_at", "resolved_date"]:
-            if col in full.columns:
-                full[col] = pd.to_datetime(full[col], errors="coerce")
-
-        if "category" not in full.columns:
-            phishing = full[full["title"].str.contains("phish", case=False, na=False)] if "title" in full.columns else pd.DataFrame()
-        else:
-            phishing = full[full["category"].str.contains("phish", case=False, na=False) | (full["category"].str.lower() == "phishing")]
-
-        if phishing.empty:
+        if phishing_per_day.empty:
             st.write("No phishing incidents found.")
         else:
-            phishing = phishing.copy()
-            phishing["day"] = phishing["date"].dt.floor("D")
-            daily = phishing.groupby("day").size().rename("count").reset_index().set_index("day").asfreq("D", fill_value=0)
-            daily["rolling_mean"] = daily["count"].rolling(window=7, min_periods=1).mean()
-            daily["is_spike"] = daily["count"] > (daily["rolling_mean"] * 2.0)
-            st.line_chart(daily["count"])
+            daily = daily_spikes(phishing_per_day)
+            st.line_chart(daily[["count", "rolling_mean"]])
+            spikes = daily[daily["is_spike"]]
+            if not spikes.empty:
+                st.caption(f"{len(spikes)} spike day(s); latest {spikes.index[-1].date()}")
 
     st.markdown("---")
     st.subheader("Manage Incidents")
@@ -106,20 +97,28 @@ def cyber_hub_ui():
                 status=status,
                 date=date.isoformat()
             )
-            conn = connect_database()
-            insert_incident(conn, new_incident.title, new_incident.severity, new_incident.status, new_incident.date)
-            conn.close()
+            with get_connection() as conn:
+                insert_incident(conn, new_incident.title, new_incident.severity, new_incident.status, new_incident.date)
             st.success(f"Incident '{new_incident.title}' added successfully!")
             safe_rerun()
 
-    with st.expander("✏️ Update Incident"):
-        incs = get_all_incidents(connect_database())
-        if len(incs) > 0:
-            if len(incs[0]) == 7: cols = ["id","title","severity","status","date","resolved_date","created_at"]
-            elif len(incs[0]) == 6: cols = ["id","title","severity","status","date","resolved_date"]
-            else: cols = None 
-            inc_df_local = pd.DataFrame(incs, columns=cols)
+    status_filter = st.selectbox(
+        "Filter by status", ["All"] + sorted(k for k in kpis["by_status"] if k), key="inc_status_filter"
+    )
+    status_value = None if status_filter == "All" else status_filter
+    search_term = st.text_input("🔍 Search incidents", placeholder="Title words or category, e.g. phish", key="inc_search")
+
+    def fetch_incidents(after, page_size):
+        with get_connection() as conn:
+            if search_term.strip():
+                return search_incidents(conn, search_term, after=after, page_size=page_size, status=status_value)
+            return get_incidents_page(conn, after=after, page_size=page_size, status=status_value)
+
+    inc_df_local = paged_grid("cyber_inc_grid", fetch_incidents, reset_on=(status_value, search_term),
+                              width='stretch')
 
+    with st.expander("✏️ Update Incident"):
+        if not inc_df_local.empty:
             if "id" in inc_df_local.columns:
                 incident_id = st.selectbox("Select ID to update", inc_df_local["id"].tolist(), key="upd_inc")
                 new_title = st.text_input("New Title", key="new_title")
@@ -127,28 +126,20 @@ def cyber_hub_ui():
                 new_status = st.selectbox("New Status", ["open", "Closed", "Investigating"], key="new_status")
                 
                 if st.button("Update Incident"):
-                    conn = connect_database()
-                    update_incident(conn, int(incident_id), title=new_title, severity=new_sev, status=new_status)
-                    conn.close()
+                    with get_connection() as conn:
+                        update_incident(conn, int(incident_id), title=new_title, severity=new_sev, status=new_status)
                     st.success("Incident updated!")
                     safe_rerun()
         else:
             st.info("No incidents to update.")
 
     with st.expander("🗑️ Delete Incident"):
-        incs = get_all_incidents(connect_database())
-        if len(incs) > 0:
-            if len(incs[0]) == 7: cols = ["id","title","severity","status","date","resolved_date","created_at"]
-            elif len(incs[0]) == 6: cols = ["id","title","severity","status","date","resolved_date"]
-            else: cols = None 
-            inc_df_local = pd.DataFrame(incs, columns=cols)
-
+        if not inc_df_local.empty:
             if "id" in inc_df_local.columns:
                 del_id = st.selectbox("Select ID to delete", inc_df_local["id"].tolist(), key="del_inc")
                 if st.button("Delete Incident"):
-                    conn = connect_database()
-                    delete_incident(conn, int(del_id))
-                    conn.close()
+                    with get_connection() as conn:
+                        delete_incident(conn, int(del_id))
                     st.success("Incident deleted!")
                     safe_rerun()
 
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 import os
 import plotly.express as px 
@@ -7,43 +8,59 @@ import plotly.express as px
 sys.path.append(os.getcwd())
 
 try:
-    from app.data.db import connect_database
-    from app.data.tickets import load_it_tickets_csv, update_ticket
+    from app.data.db import get_connection
+    from app.data.cache import cached_query, cache_stats
+    from app.data.tickets import load_it_tickets_csv, update_ticket, get_tickets_page, search_tickets
     from app.utils.stream_helpers import safe_rerun
+    from app.utils.paged_grid import paged_grid
+    from app.utils.export_button import export_button
+    from app.utils.auth_guard import require_login
+    from app.data.snapshots import snapshot_frame
+    from app.analytics.tickets import ticket_columns, ticket_stats
 except ImportError:
     st.error("⚠️ Critical modules not found. Please ensure app/data and app/utils exist.")
     st.stop()
 
 st.set_page_config(page_title="ITOps Command Center", page_icon="🛠️", layout="wide")
+require_login()
 
+TICKET_COLUMNS = ("id", "title", "priority", "status", "assigned_to", "created_date", "resolved_date")
+
+@cached_query("it_tickets", ttl=300)
 def get_data():
-    """Fetches and pre-processes data to keep UI code clean."""
-    conn = connect_database()
+    """
+    Tickets as a DataFrame plus ticket_stats() from the columnar it_tickets
+    snapshot (cached until it_tickets changes). Dates arrive typed, so no
+    string parsing happens here.
+    """
     try:
-        df = pd.read_sql_query("SELECT * FROM it_tickets", conn)
+        cols = ticket_columns(snapshot_frame("it_tickets", TICKET_COLUMNS))
     except Exception:
-        df = pd.DataFrame()
-    finally:
-        conn.close()
-
-    if not df.empty:
-        if "created_date" in df.columns:
-            df["created_date"] = pd.to_datetime(df["created_date"], errors="coerce")
-            df["age_days"] = (pd.Timestamp.now() - df["created_date"]).dt.total_seconds() / 86400.0
-            df["age_days"] = df["age_days"].round(1)
-        
-        if "resolved_date" in df.columns:
-            df["resolved_date"] = pd.to_datetime(df["resolved_date"], errors="coerce")
-            df["resolution_days"] = (df["resolved_date"] - df["created_date"]).dt.total_seconds() / 86400.0
-    
-    return df
+        return pd.DataFrame(), None
+    if len(cols["id"]) == 0:
+        return pd.DataFrame(), None
+
+    stats = ticket_stats(cols)
+    labels = lambda name: np.array(cols[f"{name}_labels"], dtype=object)[cols[name]]
+    df = pd.DataFrame({
+        "id": cols["id"],
+        "title": cols["title"],
+        "priority": labels("priority"),
+        "status": labels("status"),
+        # MISSING (int64 min) is NaT in datetime64
+        "created_date": cols["created"].astype("datetime64[s]"),
+        "resolved_date": cols["resolved"].astype("datetime64[s]"),
+        "assigned_to": labels("assignee"),
+        "age_days": stats["age_days"].round(1),
+        "resolution_days": stats["resolution_days"],
+    })
+    return df, stats
 
 def handle_data_seeding(df):
     """Handles the logic for loading initial CSV data if DB is empty."""
     if len(df) == 0 and not st.session_state.get("_itops_auto_load_done", False):
-        conn2 = connect_database()
-        loaded = load_it_tickets_csv(conn2, force=False)
-        conn2.close()
+        with get_connection() as conn2:
+            loaded = load_it_tickets_csv(conn2, force=False)
         st.session_state["_itops_auto_load_done"] = True
         if loaded > 0:
             st.toast(f"System initialized: {loaded} tickets loaded.", icon="🚀")
@@ -60,30 +77,21 @@ def itops_hub_ui():
         unsafe_allow_html=True,
     )
 
-    df = get_data()
+    df, stats = get_data()
     handle_data_seeding(df)
 
-    if not df.empty:
-        total = len(df)
-        open_cnt = df[df.get("status", "").str.lower() == "open"].shape[0]
-        waiting = df[df.get("status", "").str.lower() == "waiting_user"].shape[0]
-        
-        avg_res_time = 0
-        if "resolution_days" in df.columns:
-            closed_tickets = df[df["resolution_days"].notna()]
-            if not closed_tickets.empty:
-                avg_res_time = closed_tickets["resolution_days"].mean()
-
-        k1, k2, k3, k4 = st.columns(4)
-        k1.metric("Total Tickets", total, border=True)
-        k2.metric("Active (Open)", open_cnt, delta="Queue Load", delta_color="inverse", border=True)
-        k3.metric("Waiting on User", waiting, border=True)
-        k4.metric("Avg Resolution Time", f"{avg_res_time:.1f} days", border=True)
+    if stats is not None:
+        k1, k2, k3, k4, k5 = st.columns(5)
+        k1.metric("Total Tickets", stats["total"], border=True)
+        k2.metric("Active (Open)", stats["open"], delta="Queue Load", delta_color="inverse", border=True)
+        k3.metric("Waiting on User", stats["waiting_user"], border=True)
+        k4.metric("Avg Resolution Time", f"{stats['avg_resolution_days']:.1f} days", border=True)
+        k5.metric("SLA Breached (Open)", stats["sla"]["open_breached"], border=True)
 
     tab_analytics, tab_ops, tab_admin = st.tabs(["📊 Analytics & Performance", "🎫 Ticket Operations", "⚙️ Admin & Settings"])
 
     with tab_analytics:
-        if df.empty:
+        if stats is None:
             st.info("No data available for analytics.")
         else:
             col_left, col_right = st.columns(2)
@@ -91,36 +99,33 @@ def itops_hub_ui():
             with col_left:
                 st.subheader("Ticket Aging")
                 st.caption("Average age of open tickets by status")
-                if "status" in df.columns and "age_days" in df.columns:
-                    open_df = df[df["status"].str.lower() != "closed"]
-                    if not open_df.empty:
-                        avg_age = open_df.groupby("status")["age_days"].mean()
-                        st.bar_chart(avg_age, color="#059669", use_container_width=True)
-                    else:
-                        st.success("No open tickets!")
+                if stats["aging_by_status"]:
+                    avg_age = pd.Series(stats["aging_by_status"], name="age_days")
+                    st.bar_chart(avg_age, color="#059669", use_container_width=True)
+                else:
+                    st.success("No open tickets!")
 
             with col_right:
                 st.subheader("Staff Performance")
-                st.caption("Average resolution time (days) by assignee")
-                if "assigned_to" in df.columns and "resolution_days" in df.columns:
-                    resolved = df[df["resolution_days"].notna()]
-                    if not resolved.empty:
-                        staff_perf = resolved.groupby("assigned_to")["resolution_days"].mean().sort_values()
-                        st.bar_chart(staff_perf, horizontal=True, use_container_width=True)
-                    else:
-                        st.info("No resolved tickets yet.")
+                st.caption("Resolution time (days) by assignee")
+                if stats["assignee_resolution"]:
+                    staff_perf = pd.DataFrame.from_dict(stats["assignee_resolution"], orient="index")
+                    st.bar_chart(staff_perf["mean"].sort_values(), horizontal=True, use_container_width=True)
+                    st.dataframe(staff_perf.round(1), use_container_width=True)
                 else:
-                    st.warning("Missing assignment data.")
+                    st.info("No resolved tickets yet.")
 
             st.markdown("---")
             st.subheader("🐢 Slowest Resolving Tickets")
-            if "resolution_days" in df.columns:
-                slowest = df.sort_values("resolution_days", ascending=False).head(10)
+            if len(stats["slowest"]):
+                slowest = df.iloc[stats["slowest"]]
                 st.dataframe(
                     slowest[["id", "title", "assigned_to", "resolution_days", "status"]], 
                     use_container_width=True,
                     hide_index=True
                 )
+            else:
+                st.info("No resolved tickets yet.")
 
     with tab_ops:
         c_list, c_edit = st.columns([2, 1], gap="large")
@@ -130,35 +135,40 @@ def itops_hub_ui():
             
             search_term = st.text_input("🔍 Search tickets...", placeholder="Type title, ID, or assignee")
             
-            display_df = df.copy()
-            if search_term:
-                display_df = display_df[
-                    display_df.astype(str).apply(lambda x: x.str.contains(search_term, case=False)).any(axis=1)
-                ]
-
-            st.dataframe(
-                display_df, 
-                use_container_width=True, 
-                height=500,
-                column_config={
-                    "created_date": st.column_config.DateColumn("Created", format="YYYY-MM-DD"),
-                    "status": st.column_config.SelectboxColumn("Status", width="small", options=["open", "closed", "waiting_user"]),
-                    "age_days": st.column_config.NumberColumn("Age (Days)", format="%.1f")
-                }
+            status_opts = sorted(df["status"].dropna().unique().tolist()) if "status" in df.columns else []
+            queue_status = st.multiselect("Status", status_opts, key="queue_status")
+
+            queue_column_config = {
+                "created_date": st.column_config.DateColumn("Created", format="YYYY-MM-DD"),
+                "status": st.column_config.SelectboxColumn("Status", width="small", options=["open", "closed", "waiting_user"]),
+                "age_days": st.column_config.NumberColumn("Age (Days)", format="%.1f")
+            }
+
+            def fetch_tickets(after, page_size):
+                with get_connection() as connp:
+                    if search_term:
+                        # FTS5 index, best match first
+                        return search_tickets(connp, search_term, after=after, page_size=page_size,
+                                              status=queue_status or None)
+                    return get_tickets_page(connp, after=after, page_size=page_size, status=queue_status or None)
+
+            display_df = paged_grid(
+                "itops_queue_grid", fetch_tickets, reset_on=(search_term, tuple(queue_status)),
+                use_container_width=True, height=500, column_config=queue_column_config
             )
 
         with c_edit:
             st.markdown("### ✏️ Quick Action")
             st.info("Select a ticket ID to update status or reassignment.")
             
-            if not df.empty:
+            if not display_df.empty:
                 with st.form("update_ticket_form"):
-                    ticket_ids = df["id"].tolist()
+                    ticket_ids = display_df["id"].tolist()
                     ticket_ids.sort()
                     
                     selected_id = st.selectbox("Select Ticket ID", ticket_ids)
                     
-                    current_ticket = df[df["id"] == selected_id].iloc[0]
+                    current_ticket = display_df[display_df["id"] == selected_id].iloc[0]
                     curr_assign = current_ticket.get("assigned_to", "")
                     curr_status = current_ticket.get("status", "open")
                     
@@ -171,9 +181,8 @@ def itops_hub_ui():
                     submit_btn = st.form_submit_button("Update Ticket", type="primary", use_container_width=True)
                     
                     if submit_btn:
-                        connu = connect_database()
-                        update_ticket(connu, int(selected_id), status=new_status, assigned_to=new_assignee)
-                        connu.close()
+                        with get_connection() as connu:
+                            update_ticket(connu, int(selected_id), status=new_status, assigned_to=new_assignee)
                         st.success(f"Ticket #{selected_id} updated!")
                         safe_rerun()
             else:
@@ -186,14 +195,21 @@ def itops_hub_ui():
         col_act1, col_act2 = st.columns(2)
         with col_act1:
             if st.button("Force Reload from CSV", use_container_width=True):
-                conn2 = connect_database()
-                loaded = load_it_tickets_csv(conn2, force=True)
-                conn2.close()
+                with get_connection() as conn2:
+                    loaded = load_it_tickets_csv(conn2, force=True)
                 st.success(f"Database reset. Loaded {loaded} rows.")
                 safe_rerun()
+            if st.button("Sync Changes from CSV", use_container_width=True):
+                with get_connection() as conn2:
+                    changed = load_it_tickets_csv(conn2, incremental=True)
+                st.success(f"Incremental sync applied {changed} inserts/updates.")
+                safe_rerun()
         
         with col_act2:
-            st.caption("Additional admin tools can be added here (e.g., Export to Excel, Delete All).")
+            st.write("**Export tickets**")
+            export_button("tickets_export", "it_tickets", "it_tickets", label="Export Tickets")
+            st.write("**Query cache**")
+            st.json(cache_stats())
 
 if __name__ == "__main__":
     itops_hub_ui()
\ No newline at end of file
@@ -6,10 +6,18 @@ import time
 
 sys.path.append(os.getcwd())
 
+# Largest archiving candidates rendered in the simulator table.
+ARCHIVE_TOP_K = 500
+
 try:
-    from app.data.db import connect_database
+    from app.data.db import get_connection
+    from app.data.cache import cached_query
     from app.data.datasets import load_datasets_metadata_csv
+    from app.data.snapshots import snapshot_frame
+    from app.analytics.archiving import ArchiveIndex
     from app.utils.stream_helpers import safe_rerun
+    from app.utils.auth_guard import require_login
+    from app.utils.export_button import export_button
 except ImportError:
     st.error("⚠️ Critical modules not found. Ensure app/data and app/utils exist.")
     st.stop()
@@ -20,26 +28,30 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
+require_login()
 
+@cached_query("datasets_metadata", ttl=300)
 def get_data():
-    conn = connect_database()
+    """
+    Catalog with typed dates and age, newest first, from the columnar
+    snapshot (cached until datasets_metadata changes).
+    """
     try:
-        df = pd.read_sql_query("SELECT * FROM datasets_metadata ORDER BY id DESC", conn)
+        df = snapshot_frame("datasets_metadata").iloc[::-1].reset_index(drop=True)
     except Exception:
         df = pd.DataFrame()
-    finally:
-        conn.close()
     
     if not df.empty:
-        if "file_size_mb" in df.columns:
-            df["file_size_mb"] = pd.to_numeric(df["file_size_mb"], errors="coerce").fillna(0.0)
-        if "record_count" in df.columns:
-            df["record_count"] = pd.to_numeric(df["record_count"], errors="coerce").fillna(0)
-        if "last_updated" in df.columns:
-            df["last_updated"] = pd.to_datetime(df["last_updated"], errors="coerce")
-            df["age_days"] = (pd.Timestamp.now() - df["last_updated"]).dt.days
+        df["file_size_mb"] = df["file_size_mb"].fillna(0.0)
+        df["record_count"] = df["record_count"].fillna(0)
+        df["age_days"] = (pd.Timestamp.now() - df["last_updated"]).dt.days
     return df
 
+@cached_query("datasets_metadata", ttl=300)
+def get_archive_index():
+    """Sorted archiving indexes over get_data() (rebuilt when datasets_metadata changes)."""
+    return ArchiveIndex.from_frame(get_data())
+
 def governance_dashboard_ui():
     st.markdown(
         """
@@ -71,20 +83,13 @@ def governance_dashboard_ui():
         
         st.divider()
         st.markdown("### 📥 Export")
-        if st.button("Download Full Catalog CSV"):
-            st.download_button(
-                "Click to Download",
-                df.to_csv(index=False),
-                file_name="full_catalog.csv",
-                mime="text/csv"
-            )
+        export_button("catalog_export", "datasets_metadata", "full_catalog", label="Export Full Catalog")
 
     if df.empty:
         st.warning("Catalog is empty.")
         if st.button("Initialize with CSV Data"):
-            conn2 = connect_database()
-            loaded = load_datasets_metadata_csv(conn2, force=True)
-            conn2.close()
+            with get_connection() as conn2:
+                loaded = load_datasets_metadata_csv(conn2, force=True)
             st.success(f"Loaded {loaded} records.")
             time.sleep(1)
             safe_rerun()
@@ -136,18 +141,15 @@ def governance_dashboard_ui():
         with c_filt3:
             row_thresh = st.slider("📉 Max Row Count (Sparse Data)", 0, 100000, 1000)
 
-        candidates = df.copy()
-        mask = (
-            (candidates["age_days"] > age_thresh) | 
-            ((candidates["file_size_mb"] > size_thresh) & (candidates["record_count"] < row_thresh))
-        )
-        results = candidates[mask].sort_values("file_size_mb", ascending=False)
+        archive = get_archive_index().query(age_thresh, size_thresh, row_thresh, top_k=ARCHIVE_TOP_K)
         
-        st.subheader(f"Results: {len(results)} Candidates Found")
+        st.subheader(f"Results: {archive['count']} Candidates Found")
         
-        if not results.empty:
-            potential_savings = results["file_size_mb"].sum()
-            st.caption(f"Potential Storage Savings: **{potential_savings:,.1f} MB**")
+        if archive["count"]:
+            st.caption(f"Potential Storage Savings: **{archive['savings_mb']:,.1f} MB**")
+            if archive["count"] > len(archive["top"]):
+                st.caption(f"Showing the {len(archive['top'])} largest candidates.")
+            results = df.iloc[archive["top"]]
             
             st.dataframe(
                 results[["dataset_name", "source", "age_days", "file_size_mb", "record_count"]],
@@ -175,12 +177,17 @@ def governance_dashboard_ui():
         with col_ctrl:
             st.write("**Manage Source Data**")
             if st.button("Reload from CSV (Force)", type="primary"):
-                conn2 = connect_database()
-                load_datasets_metadata_csv(conn2, force=True)
-                conn2.close()
+                with get_connection() as conn2:
+                    load_datasets_metadata_csv(conn2, force=True)
                 st.toast("Database reloaded successfully!", icon="🔄")
                 time.sleep(1)
                 safe_rerun()
+            if st.button("Sync Changes from CSV"):
+                with get_connection() as conn2:
+                    changed = load_datasets_metadata_csv(conn2, incremental=True)
+                st.toast(f"Incremental sync applied {changed} inserts/updates.", icon="🔄")
+                time.sleep(1)
+                safe_rerun()
             
             st.divider()
             st.write("**Quick Filters**")
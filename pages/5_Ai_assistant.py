@@ -7,8 +7,10 @@ root_dir = os.path.dirname(current_dir)
 sys.path.append(root_dir)
 
 from app.services.Ai_assistant import AIAssistant
+from app.utils.auth_guard import require_login
 
 st.set_page_config(page_title="AI Assistant", page_icon="🤖")
+require_login()
 
 st.markdown(
     """
@@ -0,0 +1,40 @@
+import bcrypt
+import pytest
+
+import auth
+
+
+@pytest.fixture
+def users_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.txt"
+    monkeypatch.setattr(auth, "USER_DATA_FILE", str(path))
+    monkeypatch.setattr(auth, "_user_index", {})
+    monkeypatch.setattr(auth, "_index_stamp", None)
+    monkeypatch.setattr(auth, "_index_offset", 0)
+    monkeypatch.setattr(auth, "login_limiter", auth.LoginRateLimiter())
+    return path
+
+
+def _hash(password):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(4)).decode()
+
+
+def test_last_line_without_newline_is_indexed(users_file):
+    users_file.write_text(f"alice,{_hash('secret1')}\nbob,{_hash('secret2')}")
+    assert auth.user_exists("bob")
+    assert auth.login_user("bob", "secret2")
+    assert auth.login_user("alice", "secret1")
+
+
+def test_register_after_line_without_newline(users_file):
+    users_file.write_text(f"bob,{_hash('secret2')}")
+    assert auth.user_exists("bob")
+    assert auth.register_user("carol", "secret3")
+    assert users_file.read_text().splitlines()[1].startswith("carol,")
+    assert auth.login_user("bob", "secret2")
+    assert auth.login_user("carol", "secret3")
+
+
+def test_malformed_lines_are_skipped(users_file):
+    users_file.write_text(f"dave,x,y\ndave,{_hash('secret4')}\n")
+    assert auth.login_user("dave", "secret4")